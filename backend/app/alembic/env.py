@@ -14,6 +14,8 @@ from app.core.database import Base
 from app.models.user import User
 from app.models.progress import LearningProgress
 from app.models.flashcard import Flashcard
+from app.models.skill_extraction import SkillExtraction
+from app.models.demand_history import DemandObservation, DemandRollup
 
 # Alembic Config object
 config = context.config
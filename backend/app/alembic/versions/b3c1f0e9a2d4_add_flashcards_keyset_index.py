@@ -0,0 +1,24 @@
+"""add flashcards keyset index
+
+Revision ID: b3c1f0e9a2d4
+Revises: a6b7dacb2d3d
+Create Date: 2026-10-18 19:05:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3c1f0e9a2d4'
+down_revision = 'a6b7dacb2d3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_flashcards_user_created_id', 'flashcards', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_flashcards_user_created_id', table_name='flashcards')
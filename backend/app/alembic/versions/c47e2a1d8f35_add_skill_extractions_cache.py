@@ -0,0 +1,30 @@
+"""add skill extractions cache
+
+Revision ID: c47e2a1d8f35
+Revises: b3c1f0e9a2d4
+Create Date: 2026-10-18 21:12:09.530417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e2a1d8f35'
+down_revision = 'b3c1f0e9a2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('skill_extractions',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('taxonomy_version', sa.String(length=40), nullable=False),
+    sa.Column('skills', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('content_hash', 'taxonomy_version')
+    )
+
+
+def downgrade():
+    op.drop_table('skill_extractions')
@@ -0,0 +1,52 @@
+"""add demand history
+
+Revision ID: e5a91c3b7d20
+Revises: c47e2a1d8f35
+Create Date: 2026-10-18 23:40:51.204118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a91c3b7d20'
+down_revision = 'c47e2a1d8f35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('demand_observations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_title', sa.String(length=200), nullable=False),
+    sa.Column('skill', sa.String(length=200), nullable=False),
+    sa.Column('demand_percentage', sa.Float(), nullable=False),
+    sa.Column('postings', sa.Integer(), nullable=True),
+    sa.Column('observed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_demand_observations_observed_at'), 'demand_observations', ['observed_at'], unique=False)
+    op.create_index('ix_demand_observations_job_skill', 'demand_observations', ['job_title', 'skill', 'observed_at'], unique=False)
+    op.create_table('demand_rollups',
+    sa.Column('granularity', sa.String(length=5), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('job_title', sa.String(length=200), nullable=False),
+    sa.Column('skill', sa.String(length=200), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=False),
+    sa.Column('demand_sum', sa.Float(), nullable=False),
+    sa.Column('demand_min', sa.Float(), nullable=False),
+    sa.Column('demand_max', sa.Float(), nullable=False),
+    sa.Column('last_demand', sa.Float(), nullable=False),
+    sa.Column('last_observed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('granularity', 'bucket_start', 'job_title', 'skill')
+    )
+    op.create_index('ix_demand_rollups_job', 'demand_rollups', ['job_title', 'granularity', 'bucket_start'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_demand_rollups_job', table_name='demand_rollups')
+    op.drop_table('demand_rollups')
+    op.drop_index('ix_demand_observations_job_skill', table_name='demand_observations')
+    op.drop_index(op.f('ix_demand_observations_observed_at'), table_name='demand_observations')
+    op.drop_table('demand_observations')
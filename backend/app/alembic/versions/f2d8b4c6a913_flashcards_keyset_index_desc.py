@@ -0,0 +1,29 @@
+"""flashcards keyset index in listing order
+
+Revision ID: f2d8b4c6a913
+Revises: e5a91c3b7d20
+Create Date: 2026-10-19 10:12:37.402861
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2d8b4c6a913'
+down_revision = 'e5a91c3b7d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The listing orders by created_at DESC NULLS LAST, id DESC; an ascending
+    # index read backwards gives NULLS FIRST and can't serve it
+    op.drop_index('ix_flashcards_user_created_id', table_name='flashcards')
+    op.create_index('ix_flashcards_user_created_id', 'flashcards',
+                    ['user_id', sa.text('created_at DESC NULLS LAST'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_flashcards_user_created_id', table_name='flashcards')
+    op.create_index('ix_flashcards_user_created_id', 'flashcards', ['user_id', 'created_at', 'id'], unique=False)
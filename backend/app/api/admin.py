@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, Query
+from app.core.deps import get_current_user
+from app.core.providers import get_skill_extractor, skill_extractor
+from app.core.query_stats import query_stats
+from app.models.user import User
+from app.services.analysis_queue import analysis_queue
+from app.services.demand_history import demand_history
+from app.services.extraction_cache import extraction_cache
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+@router.get("/query-stats")
+def get_query_stats(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: str = Query("total_ms", pattern="^(total_ms|max_ms|calls|rows|db_hits)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """Cypher statements aggregated by normalized text, most expensive first"""
+    return {
+        "slow_query_ms": query_stats.slow_ms,
+        "queries": query_stats.top(limit, order_by)
+    }
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user)
+):
+    """Most recent Cypher statements slower than NEO4J_SLOW_QUERY_MS"""
+    return {
+        "slow_query_ms": query_stats.slow_ms,
+        "queries": query_stats.slow_queries(limit)
+    }
+
+@router.post("/query-stats/reset")
+def reset_query_stats(current_user: User = Depends(get_current_user)):
+    """Clear query aggregates and the in-memory slow query log"""
+    query_stats.reset()
+    return {"message": "Query stats reset"}
+
+@router.get("/analysis-queue")
+def get_analysis_queue(current_user: User = Depends(get_current_user)):
+    """Worker count and scrape-and-analyze jobs by status"""
+    return analysis_queue.stats()
+
+@router.get("/extraction-cache")
+def get_extraction_cache_stats(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters of the skill extraction cache since startup"""
+    return extraction_cache.stats()
+
+@router.post("/extraction-cache/reset")
+def reset_extraction_cache_stats(current_user: User = Depends(get_current_user)):
+    """Zero the extraction cache counters; cached results are kept"""
+    extraction_cache.reset_stats()
+    return {"message": "Extraction cache stats reset"}
+
+@router.get("/demand-history")
+def get_demand_history_stats(current_user: User = Depends(get_current_user)):
+    """Observations recorded into the demand history since startup, and failed runs"""
+    return demand_history.stats()
+
+@router.get("/skill-taxonomy")
+def get_skill_taxonomy(current_user: User = Depends(get_current_user)):
+    """Size, version and reload state of the compiled skill matcher"""
+    if not skill_extractor.loaded:
+        return {"loaded": False}
+    return {"loaded": True, **skill_extractor.get().taxonomy.status()}
+
+@router.post("/skill-taxonomy/reload")
+def reload_skill_taxonomy(
+    extractor = Depends(get_skill_extractor),
+    current_user: User = Depends(get_current_user)
+):
+    """Re-read skills and aliases from the graph now instead of on the next change"""
+    extractor.taxonomy.refresh(wait=True)
+    return {"message": "Skill taxonomy reloaded", **extractor.taxonomy.status()}
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
+from datetime import datetime
 from typing import List, Optional
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.models.flashcard import Flashcard
-from app.schemas.flashcard import FlashcardCreate, FlashcardUpdate, FlashcardResponse
+from app.core.pagination import encode_cursor, decode_cursor
+from app.schemas.flashcard import FlashcardCreate, FlashcardUpdate, FlashcardResponse, FlashcardPage
 
 router = APIRouter(prefix="/api/flashcards", tags=["flashcards"])
 
@@ -26,16 +28,19 @@ def create_flashcard(
     db.refresh(db_flashcard)
     return db_flashcard
 
-@router.get("/", response_model=List[FlashcardResponse])
+@router.get("/", response_model=FlashcardPage)
 def get_flashcards(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
     category: Optional[str] = None,
     difficulty: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all active flashcards for the authenticated user with optional filters"""
+    """
+    Get active flashcards for the authenticated user with optional filters
+    Newest first; pass the returned next_cursor to fetch the following page
+    """
     query = db.query(Flashcard).filter(
         Flashcard.user_id == current_user.id,
         Flashcard.is_active == True
@@ -46,8 +51,41 @@ def get_flashcards(
     if difficulty:
         query = query.filter(Flashcard.difficulty == difficulty)
         
-    flashcards = query.order_by(Flashcard.created_at.desc()).offset(skip).limit(limit).all()
-    return flashcards
+    # Newest first, cards without a created_at last. Dated and undated
+    # cards are read with separate seeks on the (user_id, created_at DESC
+    # NULLS LAST, id DESC) index, so a deep page costs what the first does.
+    position = decode_cursor(cursor)
+    created_at, last_id = None, None
+    if position:
+        try:
+            created_at = position["created_at"]
+            last_id = int(position["id"])
+            if created_at is not None:
+                created_at = datetime.fromisoformat(created_at)
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    flashcards = []
+    if not position or created_at is not None:
+        dated = query.filter(Flashcard.created_at.isnot(None))
+        if position:
+            dated = dated.filter(tuple_(Flashcard.created_at, Flashcard.id) < (created_at, last_id))
+        flashcards = dated.order_by(
+            Flashcard.created_at.desc().nullslast(), Flashcard.id.desc()
+        ).limit(limit + 1).all()
+    if len(flashcards) <= limit:
+        undated = query.filter(Flashcard.created_at.is_(None))
+        if position and created_at is None:
+            undated = undated.filter(Flashcard.id < last_id)
+        flashcards += undated.order_by(Flashcard.id.desc()).limit(limit + 1 - len(flashcards)).all()
+
+    next_cursor = None
+    if len(flashcards) > limit:
+        flashcards = flashcards[:limit]
+        last = flashcards[-1]
+        created_at = last.created_at.isoformat() if last.created_at is not None else None
+        next_cursor = encode_cursor({"created_at": created_at, "id": last.id})
+    return {"items": flashcards, "next_cursor": next_cursor}
 
 @router.get("/categories", response_model=List[str])
 def get_categories(
@@ -1,36 +1,174 @@
-from fastapi import APIRouter, HTTPException
-from app.services.job_scraper import JobSkillExtractor
-from app.services.neo4j_service import Neo4jService
+import os
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.memory_graph import UnsupportedQueryError
+from app.core.neo4j_db import require_writable_graph
+from app.core.providers import get_skill_extractor, get_neo4j_service
+from app.services.posting_ingest import PostingIngester, DEFAULT_CHUNK_SIZE
+from app.services.analysis_queue import analysis_queue, QueueFullError
+from app.services.demand_history import demand_history
+from app.services.neo4j_service import AsyncNeo4jService, parse_since
+from app.services.graph_snapshot import andjson_lines
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
-extractor = JobSkillExtractor()
-neo4j = Neo4jService()
+async_neo4j = AsyncNeo4jService()
 
-@router.post("/scrape-and-analyze")
+@router.post("/scrape-and-analyze", status_code=202, dependencies=[Depends(require_writable_graph)])
 def scrape_and_analyze_job(job_title: str):
     """
-    Scrape job postings and extract in-demand skills using AI
+    Queue scraping of job postings and AI skill extraction for a job title
+    Returns a job id immediately; poll GET /api/jobs/analyses/{job_id} for
+    the result. A title already queued or running returns the existing job.
+    """
+    try:
+        job, created = analysis_queue.submit(job_title)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Analysis queue is full: {str(e)}")
+    return {
+        "job_id": job["job_id"],
+        "job_title": job["job_title"],
+        "status": job["status"],
+        "deduplicated": not created,
+        "status_url": f"/api/jobs/analyses/{job['job_id']}"
+    }
+
+@router.get("/analyses/{job_id}")
+def get_analysis(job_id: str):
+    """
+    Status of a queued analysis: queued, running, done or failed
+    When done, `result` holds the extracted skills.
+    """
+    job = analysis_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Analysis '{job_id}' not found")
+    return job
+
+@router.post("/ingest", dependencies=[Depends(require_writable_graph)])
+async def ingest_postings(
+    request: Request,
+    format: str = Query("jsonl", pattern="^(jsonl|csv)$"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=50000),
+    dedupe: bool = Query(settings.DEDUP_ENABLED, description="drop near-duplicate postings"),
+    extractor=Depends(get_skill_extractor),
+    neo4j=Depends(get_neo4j_service)
+):
+    """
+    Bulk load job postings and update each role's demanded skills
+    Body is JSONL or CSV with title, description and date fields. The
+    upload is spooled to disk, so memory stays bounded by chunk_size.
+    For multi-GB loads use `python -m app.services.posting_ingest`, which
+    can resume from a checkpoint.
+    """
+    fd, path = tempfile.mkstemp(suffix=f".{format}")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for block in request.stream():
+                f.write(block)
+
+        def ingest():
+            with open(path, encoding="utf-8", newline="") as f:
+                history = demand_history if settings.DEMAND_HISTORY_ENABLED else None
+                return PostingIngester(extractor, neo4j, chunk_size, dedupe=dedupe, history=history).run(f, format)
+
+        return await run_in_threadpool(ingest)
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Postings must be UTF-8: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
+    finally:
+        os.remove(path)
+
+@router.get("/market-trends")
+async def get_market_trends(
+    limit: int = Query(10, ge=1, le=100),
+    category: List[str] = Query([])
+):
+    """
+    Skills demanded by the most job roles, then by average demand
+    Repeat `category` to only include skills in those categories.
+    """
+    try:
+        return await async_neo4j.get_trending_skills(limit, category)
+    except UnsupportedQueryError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch trends: {str(e)}")
+
+@router.get("/demand-trends")
+def get_demand_trends(
+    granularity: str = Query("week", pattern="^(day|week|month)$"),
+    window: int = Query(8, ge=1, le=366, description="buckets back from the current one"),
+    job_title: Optional[str] = None,
+    skill: List[str] = Query([])
+):
+    """
+    Average demand per skill in each day/week/month bucket of the window,
+    with the change from its first to its last bucket with data
+    Averaged over all job roles unless `job_title` is given; repeat
+    `skill` to restrict the skills.
     """
     try:
-        # Scrape jobs
-        job_descriptions = extractor.scrape_linkedin_jobs(job_title)
-        
-        # Extract skills with NLP
-        skills = extractor.extract_skills(job_descriptions)
-        
-        # Update Neo4j knowledge graph
-        neo4j.update_job_skills(job_title, skills)
-        
         return {
+            "granularity": granularity,
+            "window": window,
             "job_title": job_title,
-            "total_jobs_analyzed": len(job_descriptions),
-            "top_skills": skills,
-            "insight": f"Based on {len(job_descriptions)} real job postings"
+            "skills": demand_history.trends(granularity, window, job_title, skill),
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to fetch demand trends: {str(e)}")
 
-@router.get("/market-trends")
-def get_market_trends():
-    """Show trending skills across all job roles"""
-    return neo4j.get_trending_skills()
+@router.get("/top-movers")
+def get_top_movers(
+    granularity: str = Query("week", pattern="^(day|week|month)$"),
+    window: int = Query(4, ge=2, le=366),
+    direction: str = Query("up", pattern="^(up|down)$"),
+    limit: int = Query(10, ge=1, le=100),
+    job_title: Optional[str] = None
+):
+    """Skills whose average demand rose (or fell) the most over the window"""
+    try:
+        return {
+            "granularity": granularity,
+            "window": window,
+            "direction": direction,
+            "skills": demand_history.top_movers(granularity, window, limit, direction, job_title),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch top movers: {str(e)}")
+
+@router.get("/graph")
+async def get_market_graph(
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    since: Optional[str] = None
+):
+    """
+    Full job/skill knowledge graph, keyed by elementId
+    format=ndjson streams nodes then links, one JSON object per line.
+    since=<as_of from a previous response | ISO timestamp> returns only
+    nodes and links changed after that point plus removed element ids.
+    If `since` is older than tombstone retention, removals may be lost, so
+    the full graph is returned instead with full=true (with ndjson, the
+    first line is {"full": true|false}).
+    """
+    since_at = None
+    if since:
+        try:
+            since_at = parse_since(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="since must be epoch milliseconds or ISO 8601")
+
+    if format == "ndjson":
+        items = async_neo4j.iter_graph_delta(since_at) if since_at else async_neo4j.iter_skill_graph()
+        return StreamingResponse(andjson_lines(items), media_type="application/x-ndjson")
+    try:
+        if since_at:
+            return await async_neo4j.get_graph_delta(since_at)
+        return await async_neo4j.get_skill_graph()
+    except UnsupportedQueryError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
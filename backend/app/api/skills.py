@@ -1,145 +1,285 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict
-from app.core.neo4j_db import get_neo4j, Neo4jConnection
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Optional
+from app.core.neo4j_db import get_neo4j, get_async_neo4j, require_writable_graph, Neo4jConnection, AsyncNeo4jConnection
+from app.core.memory_graph import UnsupportedQueryError
+from app.core.pagination import encode_cursor, decode_cursor
+from app.services.graph_snapshot import graph_snapshot, etag_matches, aiter_skill_graph, andjson_lines
+from app.services.skill_index import skill_index
+from app.services.skill_import import SkillImporter, parse_import, DEFAULT_BATCH_SIZE
+from app.services.readiness import readiness_engine
+from app.schemas.skill import JobSkillsBatchRequest, ReadinessRequest
 
 router = APIRouter(prefix="/api/skills", tags=["skills"])
 
+# Listing queries come in first-page / next-page pairs so each one is a
+# plain index seek; see HOT_QUERIES in app/core/graph_migrations.py
+SKILLS_FIRST_PAGE_QUERY = """
+MATCH (s:Skill)
+WHERE s.name IS NOT NULL
+RETURN s.name as name, s.category as category, s.difficulty as difficulty
+ORDER BY s.name
+LIMIT $limit
+"""
+
+SKILLS_NEXT_PAGE_QUERY = """
+MATCH (s:Skill)
+WHERE s.name > $after
+RETURN s.name as name, s.category as category, s.difficulty as difficulty
+ORDER BY s.name
+LIMIT $limit
+"""
+
+# Seek on (demand_score DESC, name ASC); name breaks ties between equal scores
+JOBS_FIRST_PAGE_QUERY = """
+MATCH (j:JobRole)
+WHERE j.demand_score IS NOT NULL
+RETURN j.name as name, j.level as level, j.demand_score as demand_score
+ORDER BY j.demand_score DESC, j.name
+LIMIT $limit
+"""
+
+JOBS_NEXT_PAGE_QUERY = """
+MATCH (j:JobRole)
+WHERE j.demand_score <= $score
+  AND (j.demand_score < $score OR j.name > $name)
+RETURN j.name as name, j.level as level, j.demand_score as demand_score
+ORDER BY j.demand_score DESC, j.name
+LIMIT $limit
+"""
+
+JOB_DETAILS_QUERY = """
+MATCH (j:JobRole {name: $job_name})
+RETURN j.name as name, j.level as level, j.demand_score as demand_score
+"""
+
+JOB_REQUIRED_SKILLS_QUERY = """
+MATCH (j:JobRole {name: $job_name})-[r:REQUIRES]->(s:Skill)
+RETURN s.name as skill, s.category as category, 
+       s.difficulty as difficulty, r.importance as importance
+ORDER BY r.importance DESC
+"""
+
+JOBS_REQUIRED_SKILLS_QUERY = """
+UNWIND $names AS name
+OPTIONAL MATCH (j:JobRole {name: name})
+OPTIONAL MATCH (j)-[r:REQUIRES]->(s:Skill)
+WITH name, j, r, s
+ORDER BY r.importance DESC
+RETURN name as job, j IS NOT NULL as found,
+       COLLECT(CASE WHEN s IS NULL THEN NULL ELSE {
+           skill: s.name, category: s.category,
+           difficulty: s.difficulty, importance: r.importance
+       } END) as required_skills
+"""
+
+JOB_SKILL_GRAPH_QUERY = """
+MATCH (j:JobRole {name: $job_name})-[r:REQUIRES]->(s:Skill)
+RETURN j.name as job, s.name as skill, s.category as category,
+       s.difficulty as difficulty, r.importance as importance
+ORDER BY r.importance DESC
+"""
+
 @router.get("/")
-def get_all_skills(neo4j: Neo4jConnection = Depends(get_neo4j)):
-    """Get all skills from Neo4j graph database"""
-    query = """
-    MATCH (s:Skill)
-    RETURN s.name as name, s.category as category, s.difficulty as difficulty
-    ORDER BY s.name
-    """
+async def get_all_skills(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    neo4j: AsyncNeo4jConnection = Depends(get_async_neo4j)
+):
+    """Get skills from Neo4j graph database, paginated by name"""
+    position = decode_cursor(cursor)
     try:
-        results = neo4j.execute_query(query)
-        return {"skills": results, "count": len(results)}
+        if position:
+            results = await neo4j.execute_query(SKILLS_NEXT_PAGE_QUERY, {
+                "after": position.get("name"),
+                "limit": limit + 1
+            })
+        else:
+            results = await neo4j.execute_query(SKILLS_FIRST_PAGE_QUERY, {"limit": limit + 1})
+    except UnsupportedQueryError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Neo4j query failed: {str(e)}")
 
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = encode_cursor({"name": results[-1]["name"]})
+    return {"skills": results, "count": len(results), "next_cursor": next_cursor}
+
 
 @router.get("/graph")
-def get_skills_graph(neo4j: Neo4jConnection = Depends(get_neo4j)):
+async def get_skills_graph(
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    if_none_match: Optional[str] = Header(None),
+    neo4j: Neo4jConnection = Depends(get_neo4j),
+    async_neo4j: AsyncNeo4jConnection = Depends(get_async_neo4j)
+):
     """
     Get complete skill graph with nodes and relationships for D3.js visualization
-    Returns nodes and links in format ready for force-directed graph
-    """
-    query = """
-    MATCH (s:Skill)
-    OPTIONAL MATCH (s)-[r:PREREQUISITE]->(s2:Skill)
-    RETURN s.name as skill, s.category as category, s.difficulty as difficulty,
-           COLLECT({target: s2.name, relationship: type(r)}) as connections
+    Returns nodes and links in format ready for force-directed graph.
+    Served from the in-memory snapshot; honours If-None-Match with 304.
+    With format=ndjson the graph is streamed straight from Neo4j, one
+    {"node": ...} / {"link": ...} object per line, nodes first.
     """
+    if format == "ndjson":
+        return StreamingResponse(
+            andjson_lines(aiter_skill_graph(async_neo4j)),
+            media_type="application/x-ndjson"
+        )
+
     try:
-        results = neo4j.execute_query(query)
-        
-        # Format for D3.js force-directed graph
-        nodes = []
-        links = []
-        node_map = {}
-        
-        # Create nodes
-        for i, record in enumerate(results):
-            node_id = i
-            node_map[record['skill']] = node_id
-            nodes.append({
-                "id": node_id,
-                "name": record['skill'],
-                "category": record['category'],
-                "difficulty": record['difficulty']
-            })
-        
-        # Create links from connections
-        for i, record in enumerate(results):
-            source_id = i
-            for conn in record['connections']:
-                if conn['target'] and conn['target'] in node_map:
-                    links.append({
-                        "source": source_id,
-                        "target": node_map[conn['target']],
-                        "type": conn['relationship']
-                    })
-        
-        return {
-            "nodes": nodes, 
-            "links": links,
-            "stats": {
-                "total_skills": len(nodes),
-                "total_connections": len(links)
-            }
-        }
+        # Rebuilds are rare; run them off the event loop
+        payload, etag = graph_snapshot.peek() or await run_in_threadpool(graph_snapshot.get, neo4j)
+    except UnsupportedQueryError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to build graph: {str(e)}")
 
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
 
-@router.get("/jobs")
-def get_all_job_roles(neo4j: Neo4jConnection = Depends(get_neo4j)):
-    """Get all job roles in the system with their metadata"""
-    query = """
-    MATCH (j:JobRole)
-    RETURN j.name as name, j.level as level, j.demand_score as demand_score
-    ORDER BY j.demand_score DESC
+
+@router.get("/path")
+def get_learning_path(
+    job_name: str,
+    known: List[str] = Query([]),
+    neo4j: Neo4jConnection = Depends(get_neo4j)
+):
+    """
+    Get an ordered learning plan for a job role
+    Prerequisites come before the skills that need them; skills in
+    `known` (and their prerequisites) are left out of the plan.
     """
     try:
-        results = neo4j.execute_query(query)
-        return {"jobs": results, "count": len(results)}
+        plan = skill_index.get(neo4j).learning_path(job_name, known)
+    except UnsupportedQueryError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to plan path: {str(e)}")
+    if plan is None:
+        raise HTTPException(status_code=404, detail=f"Job role '{job_name}' not found")
+    return plan
+
+
+@router.post("/readiness")
+def rank_job_readiness(
+    request: ReadinessRequest,
+    neo4j: Neo4jConnection = Depends(get_neo4j)
+):
+    """
+    Rank every job role by how ready the user is for it
+    Returns the top_k roles with readiness (0-100) and the biggest skill gaps
+    """
+    try:
+        return readiness_engine.get(neo4j).rank(request.skills, request.top_k)
+    except UnsupportedQueryError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rank jobs: {str(e)}")
+
+
+@router.get("/jobs")
+async def get_all_job_roles(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    neo4j: AsyncNeo4jConnection = Depends(get_async_neo4j)
+):
+    """Get job roles with their metadata, highest demand first"""
+    position = decode_cursor(cursor)
+    try:
+        if position:
+            results = await neo4j.execute_query(JOBS_NEXT_PAGE_QUERY, {
+                "score": position.get("demand_score"),
+                "name": position.get("name"),
+                "limit": limit + 1
+            })
+        else:
+            results = await neo4j.execute_query(JOBS_FIRST_PAGE_QUERY, {"limit": limit + 1})
+    except UnsupportedQueryError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch jobs: {str(e)}")
 
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        next_cursor = encode_cursor({"demand_score": last["demand_score"], "name": last["name"]})
+    return {"jobs": results, "count": len(results), "next_cursor": next_cursor}
+
+
+@router.post("/jobs/skills")
+async def get_skills_for_jobs(
+    request: JobSkillsBatchRequest,
+    neo4j: AsyncNeo4jConnection = Depends(get_async_neo4j)
+):
+    """
+    Get required skills for several job roles in one query
+    Unknown job names are listed under "unknown" instead of failing the request
+    """
+    names = list(dict.fromkeys(request.job_names))
+    try:
+        results = await neo4j.execute_query(JOBS_REQUIRED_SKILLS_QUERY, {"names": names})
+    except UnsupportedQueryError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
+
+    by_name = {record["job"]: record for record in results}
+    jobs = {}
+    unknown = []
+    for name in names:
+        record = by_name.get(name)
+        if not record or not record["found"]:
+            unknown.append(name)
+            continue
+        jobs[name] = {
+            "required_skills": record["required_skills"],
+            "count": len(record["required_skills"])
+        }
+    return {"jobs": jobs, "unknown": unknown, "count": len(jobs)}
+
 
 @router.get("/jobs/{job_name}")
-def get_job_details(job_name: str, neo4j: Neo4jConnection = Depends(get_neo4j)):
+async def get_job_details(job_name: str, neo4j: AsyncNeo4jConnection = Depends(get_async_neo4j)):
     """Get detailed information about a specific job role"""
-    query = """
-    MATCH (j:JobRole {name: $job_name})
-    RETURN j.name as name, j.level as level, j.demand_score as demand_score
-    """
     try:
-        results = neo4j.execute_query(query, {"job_name": job_name})
+        results = await neo4j.execute_query(JOB_DETAILS_QUERY, {"job_name": job_name})
         if not results:
             raise HTTPException(status_code=404, detail=f"Job role '{job_name}' not found")
         return results[0]
-    except HTTPException:
+    except (HTTPException, UnsupportedQueryError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/jobs/{job_name}/skills")
-def get_skills_for_job(job_name: str, neo4j: Neo4jConnection = Depends(get_neo4j)):
+async def get_skills_for_job(job_name: str, neo4j: AsyncNeo4jConnection = Depends(get_async_neo4j)):
     """Get skills required for a specific job role"""
-    query = """
-    MATCH (j:JobRole {name: $job_name})-[r:REQUIRES]->(s:Skill)
-    RETURN s.name as skill, s.category as category, 
-           s.difficulty as difficulty, r.importance as importance
-    ORDER BY r.importance DESC
-    """
     try:
-        results = neo4j.execute_query(query, {"job_name": job_name})
+        results = await neo4j.execute_query(JOB_REQUIRED_SKILLS_QUERY, {"job_name": job_name})
         if not results:
             raise HTTPException(status_code=404, detail=f"Job role '{job_name}' not found")
         return {"job_role": job_name, "required_skills": results, "count": len(results)}
-    except HTTPException:
+    except (HTTPException, UnsupportedQueryError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
 
 
 @router.get("/jobs/{job_name}/graph")
-def get_job_skill_graph(job_name: str, neo4j: Neo4jConnection = Depends(get_neo4j)):
+async def get_job_skill_graph(job_name: str, neo4j: AsyncNeo4jConnection = Depends(get_async_neo4j)):
     """
     Get graph showing job and its required skills
     Format optimized for visualization
     """
-    query = """
-    MATCH (j:JobRole {name: $job_name})-[r:REQUIRES]->(s:Skill)
-    RETURN j.name as job, s.name as skill, s.category as category,
-           s.difficulty as difficulty, r.importance as importance
-    ORDER BY r.importance DESC
-    """
     try:
-        results = neo4j.execute_query(query, {"job_name": job_name})
+        results = await neo4j.execute_query(JOB_SKILL_GRAPH_QUERY, {"job_name": job_name})
         if not results:
             raise HTTPException(status_code=404, detail=f"Job role '{job_name}' not found")
         
@@ -181,30 +321,58 @@ def get_job_skill_graph(job_name: str, neo4j: Neo4jConnection = Depends(get_neo4
                 "avg_importance": sum(r['importance'] for r in results) / len(results)
             }
         }
-    except HTTPException:
+    except (HTTPException, UnsupportedQueryError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/")
-def create_skill(
+@router.post("/", dependencies=[Depends(require_writable_graph)])
+async def create_skill(
     name: str, 
     category: str, 
     difficulty: str, 
-    neo4j: Neo4jConnection = Depends(get_neo4j)
+    aliases: Optional[List[str]] = Query(None, description="Other names matched as this skill"),
+    neo4j: AsyncNeo4jConnection = Depends(get_async_neo4j)
 ):
-    """Create a new skill node"""
+    """Create a skill node, or update it if one with this name exists"""
     query = """
-    CREATE (s:Skill {name: $name, category: $category, difficulty: $difficulty})
+    MERGE (s:Skill {name: $name})
+    SET s.category = $category, s.difficulty = $difficulty,
+        s.aliases = coalesce($aliases, s.aliases), s.updated_at = datetime()
     RETURN s.name as name, s.category as category, s.difficulty as difficulty
     """
     try:
-        result = neo4j.execute_write(query, {
+        result = await neo4j.execute_write(query, {
             "name": name,
             "category": category,
-            "difficulty": difficulty
+            "difficulty": difficulty,
+            "aliases": aliases
         })
+        graph_snapshot.bump()
         return {"message": "Skill created successfully", "skill": name}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create skill: {str(e)}")
+
+
+@router.post("/import", dependencies=[Depends(require_writable_graph)])
+async def import_skills(
+    request: Request,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000),
+    neo4j: Neo4jConnection = Depends(get_neo4j)
+):
+    """
+    Bulk import skills, PREREQUISITE and REQUIRES edges
+    Body is JSON ({"skills", "prerequisites", "requirements"}) or, with
+    Content-Type text/csv, rows of kind,name,category,difficulty,target,importance.
+    """
+    fmt = "csv" if "csv" in request.headers.get("content-type", "") else "json"
+    try:
+        data = parse_import((await request.body()).decode("utf-8"), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid import file: {str(e)}")
+
+    try:
+        return await run_in_threadpool(SkillImporter(neo4j, batch_size).run, data)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
@@ -14,10 +14,70 @@ class Settings(BaseSettings):
     NEO4J_URI: str
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str
+    NEO4J_MAX_POOL_SIZE: int = 50
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT: float = 30.0  # seconds
+    NEO4J_MAX_CONNECTION_LIFETIME: int = 3600  # seconds
+    NEO4J_MAX_TRANSACTION_RETRY_TIME: float = 15.0  # seconds
+    NEO4J_QUERY_TIMEOUT: float = 30.0  # seconds, per transaction
+    NEO4J_ASYNC_MAX_CONCURRENCY: int = 50  # in-flight async queries per worker
+    NEO4J_SLOW_QUERY_MS: float = 500.0
+    NEO4J_SLOW_QUERY_LOG: Optional[str] = None  # JSON-lines file for slow queries
+    NEO4J_PROFILE_QUERIES: bool = False  # prefix PROFILE to collect db hits
     
     # ChromaDB Configuration (NEW)
     CHROMA_HOST: str = "chromadb"
     CHROMA_PORT: str = "8000"
+
+    # Skill graph snapshot cache
+    GRAPH_SNAPSHOT_TTL_SECONDS: int = 60
+    GRAPH_LAYOUT_ITERATIONS: int = 50  # 0 disables server-side layout
+    GRAPH_LAYOUT_MAX_NODES: int = 1500  # larger graphs are laid out by the client
+    GRAPH_TOMBSTONE_RETENTION_DAYS: int = 7
+
+    # Graph backend: "neo4j", or "memory" to serve reads from an in-process
+    # copy loaded from GRAPH_MEMORY_DUMP (JSON) or, if unset, from Neo4j
+    GRAPH_BACKEND: str = "neo4j"
+    GRAPH_MEMORY_DUMP: Optional[str] = None
+
+    # Skill extraction
+    SPACY_MODEL: str = "en_core_web_sm"
+    SPACY_BATCH_SIZE: int = 256  # documents per nlp.pipe batch
+    SPACY_N_PROCESS: int = 1  # >1 forks worker processes for large batches
+    EXTRACTION_CACHE_ENABLED: bool = True  # per-description results in Postgres
+
+    # Near-duplicate postings (MinHash/LSH) are dropped before extraction
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.8  # estimated Jaccard similarity of word shingles
+    DEDUP_NUM_PERM: int = 64  # MinHash signature length
+    DEDUP_SHINGLE_SIZE: int = 5  # words per shingle
+    DEDUP_WINDOW: int = 100000  # distinct postings remembered per index, oldest evicted; 0 = unbounded
+
+    # Load the spaCy model, Neo4jService and Chroma client in the background
+    # at startup instead of on first use
+    STARTUP_WARM_UP: bool = False
+
+    # Demand history: every analysis run is rolled up into day/week/month
+    # buckets per (job role, skill) for trend queries
+    DEMAND_HISTORY_ENABLED: bool = True
+    DEMAND_OBSERVATION_RETENTION_DAYS: int = 180  # raw observations; rollups are kept
+
+    # Background scrape-and-analyze queue
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_MAX_PENDING: int = 100  # queued + running; more is rejected with 503
+    ANALYSIS_KEEP_FINISHED: int = 500  # finished jobs kept for polling
+
+    # Job-posting sources ("mock", "html"; comma separated)
+    JOB_SOURCES: str = "mock"
+    JOB_SOURCE_URL_TEMPLATE: Optional[str] = None  # with {query} and {page}
+    JOB_SOURCE_ITEM_SELECTOR: str = "div.job-description"  # tag.class of one posting
+    JOB_SOURCE_PAGES: int = 5
+    FETCH_MAX_WORKERS: int = 16  # pooled connections and fetch threads
+    FETCH_PER_HOST: int = 4  # concurrent requests per host
+    FETCH_MIN_INTERVAL: float = 0.2  # seconds between request starts per host
+    FETCH_TIMEOUT: float = 15.0  # seconds
+    FETCH_USER_AGENT: str = "SkillSyncBot/1.0"
+    PAGE_CACHE_DIR: str = ".page_cache"  # bodies and ETag/Last-Modified validators
+
     class Config:
         env_file = ".env"
 
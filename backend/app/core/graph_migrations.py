@@ -0,0 +1,205 @@
+"""
+Versioned schema migrations for the Neo4j graph.
+
+Each migration has an integer version and a list of statements. Applied
+versions are recorded as (:SchemaMigration) nodes, so `upgrade` only runs
+what is missing. Statements run one per write transaction (Neo4j won't
+mix schema and data changes in one), and any failure stops the run.
+
+`verify_query_plans` EXPLAINs the app's hot queries and fails if one is
+planned as a label or all-nodes scan instead of an index seek.
+
+Usage: python -m app.core.graph_migrations [upgrade|status|verify]
+"""
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+
+class GraphMigration(NamedTuple):
+    version: int
+    name: str
+    # A query, or (query, function returning its parameters)
+    statements: List[Union[str, Tuple[str, Callable[[], Dict]]]]
+
+
+def _taxonomy_seed() -> Dict:
+    # Imported here so core doesn't depend on services at import time
+    from app.services.skill_taxonomy import DEFAULT_TAXONOMY
+    return {"skills": [{"name": name, "aliases": aliases} for name, aliases in DEFAULT_TAXONOMY.items()]}
+
+
+MIGRATIONS = [
+    GraphMigration(1, "initial constraints and indexes", [
+        "CREATE CONSTRAINT schema_migration_version_unique IF NOT EXISTS FOR (m:SchemaMigration) REQUIRE m.version IS UNIQUE",
+        "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (u:User) REQUIRE u.id IS UNIQUE",
+        "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
+        "CREATE CONSTRAINT concept_name_unique IF NOT EXISTS FOR (c:Concept) REQUIRE c.name IS UNIQUE",
+        "CREATE CONSTRAINT job_role_name_unique IF NOT EXISTS FOR (j:JobRole) REQUIRE j.name IS UNIQUE",
+        "CREATE INDEX user_email_index IF NOT EXISTS FOR (u:User) ON (u.email)",
+        "CREATE INDEX skill_category_index IF NOT EXISTS FOR (s:Skill) ON (s.category)",
+        "CREATE INDEX concept_difficulty_index IF NOT EXISTS FOR (c:Concept) ON (c.difficulty)",
+    ]),
+    GraphMigration(2, "graph delta indexes", [
+        "CREATE INDEX skill_updated_at_index IF NOT EXISTS FOR (s:Skill) ON (s.updated_at)",
+        "CREATE INDEX job_role_updated_at_index IF NOT EXISTS FOR (j:JobRole) ON (j.updated_at)",
+        "CREATE INDEX requires_updated_at_index IF NOT EXISTS FOR ()-[r:REQUIRES]-() ON (r.updated_at)",
+        "CREATE INDEX demands_updated_at_index IF NOT EXISTS FOR ()-[r:DEMANDS]-() ON (r.updated_at)",
+        "CREATE INDEX prerequisite_updated_at_index IF NOT EXISTS FOR ()-[r:PREREQUISITE]-() ON (r.updated_at)",
+        "CREATE INDEX tombstone_removed_at_index IF NOT EXISTS FOR (t:GraphTombstone) ON (t.removed_at)",
+    ]),
+    GraphMigration(3, "demand score and relationship property indexes", [
+        "CREATE INDEX job_role_demand_score_index IF NOT EXISTS FOR (j:JobRole) ON (j.demand_score)",
+        "CREATE INDEX requires_importance_index IF NOT EXISTS FOR ()-[r:REQUIRES]-() ON (r.importance)",
+        "CREATE INDEX demands_demand_percentage_index IF NOT EXISTS FOR ()-[r:DEMANDS]-() ON (r.demand_percentage)",
+        # /api/skills/jobs only lists roles with a score
+        "MATCH (j:JobRole) WHERE j.demand_score IS NULL SET j.demand_score = 0",
+    ]),
+    GraphMigration(4, "skill demand aggregates", [
+        "CREATE INDEX skill_demand_trend_index IF NOT EXISTS FOR (s:Skill) ON (s.demand_job_count, s.demand_avg)",
+        # Seed the aggregates update_job_skills maintains from existing edges
+        """
+        MATCH (s:Skill)
+        OPTIONAL MATCH (:JobRole)-[r:DEMANDS]->(s)
+        WITH s, count(r) as jobs, sum(coalesce(r.demand_percentage, 0)) as total
+        SET s.demand_job_count = jobs,
+            s.demand_sum = total,
+            s.demand_avg = CASE WHEN jobs > 0 THEN toFloat(total) / jobs END,
+            s.demand_updated_at = datetime()
+        """,
+    ]),
+    GraphMigration(5, "skill taxonomy aliases", [
+        # Built-in skills and aliases under their display names. A node
+        # already named that way gains the aliases; otherwise one that
+        # differs only in case (e.g. "python" from earlier analyses) is
+        # renamed to the display name, so no case-variant duplicates appear
+        ("""
+        UNWIND $skills AS seed
+        OPTIONAL MATCH (existing:Skill) WHERE toLower(existing.name) = toLower(seed.name)
+        WITH seed, collect(existing) as found
+        WITH seed, found, [s IN found WHERE s.name = seed.name] as exact
+        FOREACH (_ IN CASE WHEN size(found) = 0 THEN [1] ELSE [] END |
+            CREATE (:Skill {name: seed.name, aliases: seed.aliases, updated_at: datetime()}))
+        FOREACH (s IN CASE WHEN size(exact) > 0 THEN exact ELSE found[0..1] END |
+            SET s.name = seed.name,
+                s.aliases = coalesce(s.aliases, []) + [a IN seed.aliases WHERE NOT a IN coalesce(s.aliases, [])],
+                s.updated_at = datetime())
+        """, _taxonomy_seed),
+    ]),
+]
+
+# Plan operators that mean a query read a whole label or the whole graph
+SCAN_OPERATORS = {
+    "AllNodesScan",
+    "NodeByLabelScan",
+    "DirectedAllRelationshipsScan",
+    "UndirectedAllRelationshipsScan",
+    "DirectedRelationshipTypeScan",
+    "UndirectedRelationshipTypeScan",
+}
+
+
+def hot_queries() -> List[Tuple[str, str, Dict]]:
+    """(name, query, sample parameters) for queries that must be index-backed"""
+    from app.api import skills
+    from app.services import neo4j_service
+
+    queries = [
+        ("skills first page", skills.SKILLS_FIRST_PAGE_QUERY, {"limit": 101}),
+        ("skills next page", skills.SKILLS_NEXT_PAGE_QUERY, {"after": "M", "limit": 101}),
+        ("jobs first page", skills.JOBS_FIRST_PAGE_QUERY, {"limit": 101}),
+        ("jobs next page", skills.JOBS_NEXT_PAGE_QUERY, {"score": 50, "name": "M", "limit": 101}),
+        ("job details", skills.JOB_DETAILS_QUERY, {"job_name": "ML Engineer"}),
+        ("job required skills", skills.JOB_REQUIRED_SKILLS_QUERY, {"job_name": "ML Engineer"}),
+        ("jobs required skills", skills.JOBS_REQUIRED_SKILLS_QUERY, {"names": ["ML Engineer"]}),
+        ("job demanded skills", neo4j_service.JOB_SKILLS_QUERY, {"job_role": "ML Engineer"}),
+        ("graph removals", neo4j_service.REMOVED_QUERY, {"since": datetime(2000, 1, 1)}),
+        ("trending skills", neo4j_service.TRENDING_SKILLS_QUERY, {"limit": 10, "categories": []}),
+    ]
+    for label in neo4j_service.DELTA_NODE_LABELS:
+        queries.append((f"changed {label} nodes",
+                        neo4j_service.CHANGED_NODES_QUERY.format(label=label),
+                        {"since": datetime(2000, 1, 1)}))
+    for rel_type in neo4j_service.DELTA_RELATIONSHIP_TYPES:
+        queries.append((f"changed {rel_type} links",
+                        neo4j_service.CHANGED_LINKS_QUERY.format(rel_type=rel_type),
+                        {"since": datetime(2000, 1, 1)}))
+    return queries
+
+
+def applied_versions(conn) -> List[int]:
+    try:
+        rows = conn.execute_query("MATCH (m:SchemaMigration) RETURN m.version as version ORDER BY version")
+    except Exception:
+        return []
+    return [row["version"] for row in rows]
+
+
+def upgrade(conn, target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to `target` (default: latest); returns applied versions"""
+    done = set(applied_versions(conn))
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done or (target is not None and migration.version > target):
+            continue
+        print(f"🔧 Applying graph migration {migration.version}: {migration.name}")
+        for statement in migration.statements:
+            query, params = statement if isinstance(statement, tuple) else (statement, None)
+            conn.execute_write(query, params() if params else None)
+        conn.execute_write("""
+            MERGE (m:SchemaMigration {version: $version})
+            SET m.name = $name, m.applied_at = datetime()
+        """, {"version": migration.version, "name": migration.name})
+        applied.append(migration.version)
+    return applied
+
+
+def _operators(plan) -> List[str]:
+    if not plan:
+        return []
+    # Neo4j 5 suffixes operator names with the runtime, e.g. "NodeByLabelScan@neo4j"
+    found = [plan.get("operatorType", "").split("@")[0]]
+    for child in plan.get("children", []):
+        found.extend(_operators(child))
+    return found
+
+
+def verify_query_plans(conn) -> List[Dict]:
+    """
+    EXPLAIN every hot query; raise RuntimeError listing any that scan
+    Returns the operators of each plan when all are index-backed.
+    """
+    report = []
+    failures = []
+    for name, query, params in hot_queries():
+        operators = _operators(conn.explain(query, params))
+        scans = sorted(set(operators) & SCAN_OPERATORS)
+        report.append({"query": name, "operators": operators, "scans": scans})
+        if scans:
+            failures.append(f"{name}: {', '.join(scans)}")
+    if failures:
+        raise RuntimeError("Hot queries fell back to scans:\n  " + "\n  ".join(failures))
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.neo4j_db import neo4j_conn
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    neo4j_conn.connect()
+    try:
+        if command == "status":
+            done = set(applied_versions(neo4j_conn))
+            for migration in MIGRATIONS:
+                mark = "✅" if migration.version in done else "⏳"
+                print(f"{mark} {migration.version}: {migration.name}")
+        elif command == "verify":
+            for entry in verify_query_plans(neo4j_conn):
+                print(f"✅ {entry['query']}: {' -> '.join(entry['operators'])}")
+        else:
+            applied = upgrade(neo4j_conn)
+            print(f"✅ Applied {len(applied)} graph migration(s)")
+            verify_query_plans(neo4j_conn)
+            print("✅ Hot query plans are index-backed")
+    finally:
+        neo4j_conn.close()
@@ -1,46 +1,31 @@
 from app.core.neo4j_db import neo4j_conn
+from app.core.graph_migrations import upgrade
 
 def initialize_neo4j_schema():
     """
     Initialize Neo4j database with constraints and indexes
-    Run this once when setting up the database
+    Applies any pending versioned migrations from app.core.graph_migrations
     """
-    
-    queries = [
-        # Create uniqueness constraints
-        "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (u:User) REQUIRE u.id IS UNIQUE",
-        "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
-        "CREATE CONSTRAINT concept_name_unique IF NOT EXISTS FOR (c:Concept) REQUIRE c.name IS UNIQUE",
-        "CREATE CONSTRAINT job_role_name_unique IF NOT EXISTS FOR (j:JobRole) REQUIRE j.name IS UNIQUE",
-        
-        # Create indexes for better query performance
-        "CREATE INDEX user_email_index IF NOT EXISTS FOR (u:User) ON (u.email)",
-        "CREATE INDEX skill_category_index IF NOT EXISTS FOR (s:Skill) ON (s.category)",
-        "CREATE INDEX concept_difficulty_index IF NOT EXISTS FOR (c:Concept) ON (c.difficulty)",
-    ]
-    
     print("🔧 Initializing Neo4j schema...")
-    
-    for query in queries:
-        try:
-            neo4j_conn.execute_query(query)
-            print(f"✅ Executed: {query[:50]}...")
-        except Exception as e:
-            print(f"⚠️  Warning: {e}")
-    
-    print("✅ Neo4j schema initialization complete!")
+    applied = upgrade(neo4j_conn)
+    print(f"✅ Neo4j schema initialization complete! ({len(applied)} migration(s) applied)")
 
 def create_sample_data():
     """
     Create some sample nodes for testing
     """
     queries = [
-        # Create sample skills
+        # Create sample skills; MERGE on the name alone so the nodes seeded by
+        # graph migration 5 are reused rather than duplicated
         """
-        MERGE (s1:Skill {name: 'Python', category: 'Programming Language', difficulty: 'Beginner'})
-        MERGE (s2:Skill {name: 'Machine Learning', category: 'AI/ML', difficulty: 'Intermediate'})
-        MERGE (s3:Skill {name: 'FastAPI', category: 'Framework', difficulty: 'Intermediate'})
-        MERGE (s4:Skill {name: 'Docker', category: 'DevOps', difficulty: 'Intermediate'})
+        MERGE (s1:Skill {name: 'Python'})
+        SET s1.category = 'Programming Language', s1.difficulty = 'Beginner'
+        MERGE (s2:Skill {name: 'Machine Learning'})
+        SET s2.category = 'AI/ML', s2.difficulty = 'Intermediate'
+        MERGE (s3:Skill {name: 'FastAPI'})
+        SET s3.category = 'Framework', s3.difficulty = 'Intermediate'
+        MERGE (s4:Skill {name: 'Docker'})
+        SET s4.category = 'DevOps', s4.difficulty = 'Intermediate'
         """,
         
         # Create sample job roles
@@ -73,7 +58,7 @@ def create_sample_data():
     
     for query in queries:
         try:
-            neo4j_conn.execute_query(query)
+            neo4j_conn.execute_write(query)
         except Exception as e:
             print(f"⚠️  Error: {e}")
     
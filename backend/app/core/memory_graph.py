@@ -0,0 +1,534 @@
+"""
+Embedded, in-process graph backend.
+
+MemoryGraphConnection implements the Neo4jConnection interface
+(connect/close/execute_query/stream_query/execute_write) over a graph held
+in memory, so read-mostly deployments, local benchmarks and tests can run
+without a network round trip or a live Neo4j. Cypher isn't interpreted:
+the app's fixed read queries are recognised by their exact text and
+answered with dict lookups and adjacency lists. Anything else raises.
+
+The graph is a snapshot loaded from a JSON dump or copied from Neo4j:
+
+    python -m app.core.memory_graph dump graph.json
+
+writes the dump; set GRAPH_BACKEND=memory and GRAPH_MEMORY_DUMP=graph.json
+to serve from it. Writes are not supported; routes that write answer
+503 (require_writable_graph) and reload() takes a fresh copy. A query
+the graph can't serve raises UnsupportedQueryError, which the API also
+answers with 503.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from app.core.config import settings
+from app.core.query_stats import track
+
+DUMP_NODES_QUERY = """
+MATCH (n)
+RETURN elementId(n) as id, labels(n) as labels, properties(n) as properties
+"""
+
+DUMP_RELATIONSHIPS_QUERY = """
+MATCH (n)-[r]->(m)
+RETURN elementId(r) as id, type(r) as type, elementId(n) as start,
+       elementId(m) as end, properties(r) as properties
+"""
+
+
+class UnsupportedQueryError(Exception):
+    """The in-memory graph has no handler for this query"""
+
+
+class ReadOnlyGraphError(UnsupportedQueryError):
+    """A write was sent to the read-only in-memory graph"""
+
+
+def _native(value):
+    """Convert neo4j temporal values to datetime; leave everything else alone"""
+    if isinstance(value, list):
+        return [_native(v) for v in value]
+    if hasattr(value, "to_native"):
+        return value.to_native()
+    return value
+
+
+def _parse_properties(properties: Dict) -> Dict:
+    """Restore `*_at` timestamps that a JSON dump stored as ISO strings"""
+    parsed = {}
+    for key, value in properties.items():
+        if key.endswith("_at") and isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+        parsed[key] = value
+    return parsed
+
+
+def _sort(rows: List[Dict], key: str, descending: bool = False) -> List[Dict]:
+    """Sort like Cypher ORDER BY: nulls last ascending, first descending"""
+    return sorted(rows, key=lambda row: (row[key] is None, row[key]), reverse=descending)
+
+
+class MemoryGraph:
+    """
+    Immutable property graph with per-label and per-name lookups.
+    Relationships live in one list; `out` and `incoming` map
+    (node id, relationship type) to positions in it.
+    """
+
+    def __init__(self, nodes: Iterable[Dict], relationships: Iterable[Dict]):
+        self.nodes: Dict[str, Dict] = {}
+        self.by_label: Dict[str, List[str]] = defaultdict(list)
+        self.by_name: Dict[tuple, str] = {}
+        for node in nodes:
+            node = {"id": node["id"], "labels": list(node["labels"]),
+                    "properties": _parse_properties(node["properties"])}
+            self.nodes[node["id"]] = node
+            for label in node["labels"]:
+                self.by_label[label].append(node["id"])
+                name = node["properties"].get("name")
+                if name is not None:
+                    self.by_name[(label, name)] = node["id"]
+
+        self.relationships: List[Dict] = []
+        self.by_type: Dict[str, List[int]] = defaultdict(list)
+        self.out: Dict[tuple, List[int]] = defaultdict(list)
+        self.incoming: Dict[tuple, List[int]] = defaultdict(list)
+        self.connected = set()
+        for rel in relationships:
+            if rel["start"] not in self.nodes or rel["end"] not in self.nodes:
+                continue
+            i = len(self.relationships)
+            self.relationships.append({"id": rel["id"], "type": rel["type"], "start": rel["start"],
+                                       "end": rel["end"], "properties": _parse_properties(rel["properties"])})
+            self.by_type[rel["type"]].append(i)
+            self.out[(rel["start"], rel["type"])].append(i)
+            self.incoming[(rel["end"], rel["type"])].append(i)
+            self.connected.update((rel["start"], rel["end"]))
+
+    @classmethod
+    def from_dump(cls, data: Dict) -> "MemoryGraph":
+        return cls(data.get("nodes", []), data.get("relationships", []))
+
+    @classmethod
+    def from_json(cls, path: str) -> "MemoryGraph":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dump(json.load(f))
+
+    @classmethod
+    def from_neo4j(cls, conn) -> "MemoryGraph":
+        """Copy every node and relationship out of a Neo4jConnection"""
+        nodes = [
+            {**record, "properties": {k: _native(v) for k, v in record["properties"].items()}}
+            for record in conn.stream_query(DUMP_NODES_QUERY)
+        ]
+        relationships = [
+            {**record, "properties": {k: _native(v) for k, v in record["properties"].items()}}
+            for record in conn.stream_query(DUMP_RELATIONSHIPS_QUERY)
+        ]
+        return cls(nodes, relationships)
+
+    def to_dump(self) -> Dict:
+        return {"nodes": list(self.nodes.values()), "relationships": self.relationships}
+
+    def label(self, label: str) -> Iterator[Dict]:
+        for node_id in self.by_label.get(label, []):
+            yield self.nodes[node_id]
+
+    def find(self, label: str, name) -> Optional[Dict]:
+        node_id = self.by_name.get((label, name))
+        return self.nodes[node_id] if node_id is not None else None
+
+    def edges(self, rel_type: str, start_label: str = None, end_label: str = None) -> Iterator[tuple]:
+        """Yield (relationship, start node, end node) for one relationship type"""
+        for i in self.by_type.get(rel_type, []):
+            rel = self.relationships[i]
+            start, end = self.nodes[rel["start"]], self.nodes[rel["end"]]
+            if start_label and start_label not in start["labels"]:
+                continue
+            if end_label and end_label not in end["labels"]:
+                continue
+            yield rel, start, end
+
+    def outgoing(self, node: Dict, rel_type: str, end_label: str = None) -> Iterator[tuple]:
+        """Yield (relationship, end node) for a node's outgoing edges of one type"""
+        for i in self.out.get((node["id"], rel_type), []):
+            rel = self.relationships[i]
+            end = self.nodes[rel["end"]]
+            if end_label is None or end_label in end["labels"]:
+                yield rel, end
+
+
+def _props(node: Dict, *keys: str) -> Dict:
+    return {key: node["properties"].get(key) for key in keys}
+
+
+class MemoryGraphConnection:
+    """
+    Serves the app's read queries from a MemoryGraph.
+    `source` is a JSON dump path; without one, connect() copies the graph
+    from Neo4j. Query handlers are matched on the exact query text.
+    """
+
+    def __init__(self, source: Optional[str] = settings.GRAPH_MEMORY_DUMP):
+        self.source = source
+        self.graph: Optional[MemoryGraph] = None
+        # Mirrors Neo4jConnection.driver: set once the graph is loaded
+        self.driver = None
+        self.loaded_at: Optional[datetime] = None
+        self._handlers: Optional[Dict[str, Callable]] = None
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Load the graph snapshot"""
+        if self.graph is None:
+            self.reload()
+
+    def reload(self):
+        """Take a fresh snapshot from the dump file or Neo4j"""
+        started = time.perf_counter()
+        if self.source:
+            graph = MemoryGraph.from_json(self.source)
+        else:
+            from app.core.neo4j_db import Neo4jConnection
+            conn = Neo4jConnection()
+            conn.connect()
+            try:
+                graph = MemoryGraph.from_neo4j(conn)
+            finally:
+                conn.close()
+        self.load(graph)
+        print(f"✅ In-memory graph loaded: {len(graph.nodes)} nodes, "
+              f"{len(graph.relationships)} relationships in {time.perf_counter() - started:.2f}s")
+
+    def load(self, graph: MemoryGraph):
+        """Swap in a graph; in-flight queries finish on the old one"""
+        from app.services.graph_snapshot import graph_snapshot
+        with self._lock:
+            self.graph = graph
+            self.driver = graph
+            self.loaded_at = datetime.now(timezone.utc)
+        graph_snapshot.bump()
+
+    def close(self):
+        self.graph = None
+        self.driver = None
+
+    def execute_query(self, query: str, parameters: dict = None, timeout: float = None) -> List[Dict]:
+        """Answer one of the app's known read queries"""
+        handler = self.handlers.get(query)
+        if handler is None:
+            raise UnsupportedQueryError(f"In-memory graph can't answer this query: {' '.join(query.split())[:80]}")
+        if self.graph is None:
+            raise RuntimeError("In-memory graph is not loaded")
+        with track(query) as call:
+            records = handler(self.graph, parameters or {})
+            call.rows = len(records)
+        return records
+
+    def stream_query(self, query: str, parameters: dict = None, timeout: float = None) -> Iterator[Dict]:
+        yield from self.execute_query(query, parameters, timeout)
+
+    def execute_write(self, query: str, parameters: dict = None, timeout: float = None):
+        raise ReadOnlyGraphError("The in-memory graph is read-only; write to Neo4j and reload()")
+
+    @property
+    def handlers(self) -> Dict[str, Callable]:
+        # Built on first use: the query constants live in modules that
+        # import app.core.neo4j_db, which imports this one
+        if self._handlers is None:
+            self._handlers = _build_handlers()
+        return self._handlers
+
+
+class AsyncMemoryGraphConnection:
+    """AsyncNeo4jConnection interface over a MemoryGraphConnection"""
+
+    def __init__(self, conn: MemoryGraphConnection):
+        self.conn = conn
+
+    @property
+    def driver(self):
+        return self.conn.driver
+
+    async def connect(self):
+        if self.conn.graph is None:
+            await asyncio.to_thread(self.conn.connect)
+
+    async def close(self):
+        self.conn.close()
+
+    async def execute_query(self, query: str, parameters: dict = None, timeout: float = None) -> List[Dict]:
+        return self.conn.execute_query(query, parameters, timeout)
+
+    async def stream_query(self, query: str, parameters: dict = None, timeout: float = None):
+        for record in self.conn.execute_query(query, parameters, timeout):
+            yield record
+
+    async def execute_write(self, query: str, parameters: dict = None, timeout: float = None):
+        return self.conn.execute_write(query, parameters, timeout)
+
+
+# Handlers: (graph, parameters) -> records, one per known query
+
+def _now(graph, params):
+    return [{"now": int(time.time() * 1000)}]
+
+
+def _skills_page(graph, params):
+    after = params.get("after")
+    rows = [
+        _props(s, "name", "category", "difficulty") for s in graph.label("Skill")
+        if s["properties"].get("name") is not None and (after is None or s["properties"]["name"] > after)
+    ]
+    return _sort(rows, "name")[:params["limit"]]
+
+
+def _jobs_page(graph, params):
+    score, name = params.get("score"), params.get("name")
+    rows = []
+    for j in graph.label("JobRole"):
+        row = _props(j, "name", "level", "demand_score")
+        if row["demand_score"] is None:
+            continue
+        if score is not None and not (row["demand_score"] < score
+                                      or (row["demand_score"] == score and row["name"] > name)):
+            continue
+        rows.append(row)
+    return _sort(_sort(rows, "name"), "demand_score", descending=True)[:params["limit"]]
+
+
+def _job_details(graph, params):
+    job = graph.find("JobRole", params["job_name"])
+    return [_props(job, "name", "level", "demand_score")] if job else []
+
+
+def _required_skills(graph, job):
+    rows = [
+        {"skill": s["properties"].get("name"), "category": s["properties"].get("category"),
+         "difficulty": s["properties"].get("difficulty"), "importance": r["properties"].get("importance")}
+        for r, s in graph.outgoing(job, "REQUIRES", "Skill")
+    ]
+    return _sort(rows, "importance", descending=True)
+
+
+def _job_required_skills(graph, params):
+    job = graph.find("JobRole", params["job_name"])
+    return _required_skills(graph, job) if job else []
+
+
+def _jobs_required_skills(graph, params):
+    records = []
+    for name in params["names"]:
+        job = graph.find("JobRole", name)
+        records.append({
+            "job": name,
+            "found": job is not None,
+            "required_skills": _required_skills(graph, job) if job else [],
+        })
+    return records
+
+
+def _job_skill_graph(graph, params):
+    job = graph.find("JobRole", params["job_name"])
+    if not job:
+        return []
+    return [{"job": job["properties"].get("name"), **row} for row in _required_skills(graph, job)]
+
+
+def _skill_graph(graph, params):
+    records = []
+    for s in graph.label("Skill"):
+        connections = [
+            {"target": p["properties"].get("name"), "relationship": r["type"]}
+            for r, p in graph.outgoing(s, "PREREQUISITE", "Skill")
+        ]
+        records.append({
+            "skill": s["properties"].get("name"),
+            "category": s["properties"].get("category"),
+            "difficulty": s["properties"].get("difficulty"),
+            # OPTIONAL MATCH collects one all-null map when nothing matches
+            "connections": connections or [{"target": None, "relationship": None}],
+        })
+    return _sort(records, "skill")
+
+
+def _skill_nodes(graph, params):
+    return [_props(s, "name", "category", "difficulty") for s in graph.label("Skill")]
+
+
+def _skill_links(graph, params):
+    return [
+        {"source": s["properties"].get("name"), "target": p["properties"].get("name"), "type": r["type"]}
+        for r, s, p in graph.edges("PREREQUISITE", "Skill", "Skill")
+    ]
+
+
+def _index_skills(graph, params):
+    return _sort(_skill_nodes(graph, params), "name")
+
+
+def _index_prerequisites(graph, params):
+    return [
+        {"skill": s["properties"].get("name"), "prerequisite": p["properties"].get("name")}
+        for r, s, p in graph.edges("PREREQUISITE", "Skill", "Skill")
+    ]
+
+
+def _index_requirements(graph, params):
+    rows = []
+    for j in graph.label("JobRole"):
+        required = [
+            {"job": j["properties"].get("name"), "skill": s["properties"].get("name"),
+             "importance": r["properties"].get("importance")}
+            for r, s in graph.outgoing(j, "REQUIRES", "Skill")
+        ]
+        # OPTIONAL MATCH: one null row for a role without requirements
+        rows.extend(required or [{"job": j["properties"].get("name"), "skill": None, "importance": None}])
+    return _sort(rows, "job")
+
+
+def _job_skill_weights(graph, params):
+    return [
+        {"job": j["properties"].get("name"), "skill": s["properties"].get("name"), "type": r["type"],
+         "importance": r["properties"].get("importance"), "demand": r["properties"].get("demand_percentage")}
+        for rel_type in ("REQUIRES", "DEMANDS")
+        for r, j, s in graph.edges(rel_type, "JobRole", "Skill")
+    ]
+
+
+def _graph_node(node):
+    return {"id": node["id"], "name": node["properties"].get("name"),
+            "type": node["labels"][0] if node["labels"] else None}
+
+
+def _graph_link(rel):
+    return {"id": rel["id"], "source": rel["start"], "target": rel["end"], "type": rel["type"]}
+
+
+def _graph_nodes(graph, params):
+    return [_graph_node(n) for n in graph.nodes.values() if n["id"] in graph.connected]
+
+
+def _graph_links(graph, params):
+    return [_graph_link(rel) for rel in graph.relationships]
+
+
+def _changed_nodes(label):
+    def handler(graph, params):
+        since = params["since"]
+        return [
+            _graph_node(n) for n in graph.label(label)
+            if n["properties"].get("updated_at") is not None and n["properties"]["updated_at"] > since
+        ]
+    return handler
+
+
+def _changed_links(rel_type):
+    def handler(graph, params):
+        since = params["since"]
+        return [
+            _graph_link(rel) for rel, _, _ in graph.edges(rel_type)
+            if rel["properties"].get("updated_at") is not None and rel["properties"]["updated_at"] > since
+        ]
+    return handler
+
+
+def _removed(graph, params):
+    since = params["since"]
+    return [
+        {"id": t["properties"].get("element_id"), "kind": t["properties"].get("kind")}
+        for t in graph.label("GraphTombstone")
+        if t["properties"].get("removed_at") is not None and t["properties"]["removed_at"] > since
+    ]
+
+
+def _job_demanded_skills(graph, params):
+    job = graph.find("JobRole", params["job_role"])
+    if not job:
+        return []
+    rows = [
+        {"skill": s["properties"].get("name"), "demand": r["properties"].get("demand_percentage"),
+         "priority": r["properties"].get("priority")}
+        for r, s in graph.outgoing(job, "DEMANDS", "Skill")
+    ]
+    return _sort(rows, "demand", descending=True)
+
+
+def _trending_skills(graph, params):
+    categories = params.get("categories") or []
+    rows = [
+        {"skill": s["properties"].get("name"), "category": s["properties"].get("category"),
+         "job_count": s["properties"]["demand_job_count"], "avg_demand": s["properties"]["demand_avg"],
+         "updated_at": s["properties"]["demand_updated_at"].isoformat()
+         if s["properties"].get("demand_updated_at") else None}
+        for s in graph.label("Skill")
+        if (s["properties"].get("demand_job_count") or 0) > 0
+        and s["properties"].get("demand_avg") is not None
+        and (not categories or s["properties"].get("category") in categories)
+    ]
+    return _sort(_sort(rows, "avg_demand", descending=True), "job_count", descending=True)[:params["limit"]]
+
+
+def _taxonomy(graph, params):
+    rows = [{"name": s["properties"].get("name"), "aliases": list(s["properties"].get("aliases") or [])}
+            for s in graph.label("Skill")]
+    return _sort(rows, "name")
+
+
+def _build_handlers() -> Dict[str, Callable]:
+    from app.api import skills
+    from app.services import graph_snapshot, neo4j_service, readiness, skill_index, skill_taxonomy
+
+    handlers = {
+        neo4j_service.NOW_QUERY: _now,
+        skills.SKILLS_FIRST_PAGE_QUERY: _skills_page,
+        skills.SKILLS_NEXT_PAGE_QUERY: _skills_page,
+        skills.JOBS_FIRST_PAGE_QUERY: _jobs_page,
+        skills.JOBS_NEXT_PAGE_QUERY: _jobs_page,
+        skills.JOB_DETAILS_QUERY: _job_details,
+        skills.JOB_REQUIRED_SKILLS_QUERY: _job_required_skills,
+        skills.JOBS_REQUIRED_SKILLS_QUERY: _jobs_required_skills,
+        skills.JOB_SKILL_GRAPH_QUERY: _job_skill_graph,
+        graph_snapshot.SKILL_GRAPH_QUERY: _skill_graph,
+        graph_snapshot.SKILL_NODES_QUERY: _skill_nodes,
+        graph_snapshot.SKILL_LINKS_QUERY: _skill_links,
+        skill_index.SKILLS_QUERY: _index_skills,
+        skill_index.PREREQUISITES_QUERY: _index_prerequisites,
+        skill_index.REQUIREMENTS_QUERY: _index_requirements,
+        readiness.JOB_SKILL_WEIGHTS_QUERY: _job_skill_weights,
+        neo4j_service.GRAPH_NODES_QUERY: _graph_nodes,
+        neo4j_service.GRAPH_LINKS_QUERY: _graph_links,
+        neo4j_service.REMOVED_QUERY: _removed,
+        neo4j_service.JOB_SKILLS_QUERY: _job_demanded_skills,
+        neo4j_service.TRENDING_SKILLS_QUERY: _trending_skills,
+        skill_taxonomy.TAXONOMY_QUERY: _taxonomy,
+    }
+    for label in neo4j_service.DELTA_NODE_LABELS:
+        handlers[neo4j_service.CHANGED_NODES_QUERY.format(label=label)] = _changed_nodes(label)
+    for rel_type in neo4j_service.DELTA_RELATIONSHIP_TYPES:
+        handlers[neo4j_service.CHANGED_LINKS_QUERY.format(rel_type=rel_type)] = _changed_links(rel_type)
+    return handlers
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.neo4j_db import Neo4jConnection
+
+    if len(sys.argv) != 3 or sys.argv[1] != "dump":
+        sys.exit("Usage: python -m app.core.memory_graph dump <path.json>")
+
+    neo4j = Neo4jConnection()
+    neo4j.connect()
+    try:
+        graph = MemoryGraph.from_neo4j(neo4j)
+    finally:
+        neo4j.close()
+    with open(sys.argv[2], "w", encoding="utf-8") as f:
+        json.dump(graph.to_dump(), f, default=lambda v: v.isoformat())
+    print(f"✅ Dumped {len(graph.nodes)} nodes and {len(graph.relationships)} relationships to {sys.argv[2]}")
@@ -1,19 +1,40 @@
-from neo4j import GraphDatabase
+import asyncio
+from fastapi import HTTPException
+from neo4j import AsyncGraphDatabase, GraphDatabase, Query, READ_ACCESS
 from app.core.config import settings
+from app.core.query_stats import profiled, track
+
+
+def _driver_options() -> dict:
+    return {
+        "max_connection_pool_size": settings.NEO4J_MAX_POOL_SIZE,
+        "connection_acquisition_timeout": settings.NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+        "max_connection_lifetime": settings.NEO4J_MAX_CONNECTION_LIFETIME,
+        "max_transaction_retry_time": settings.NEO4J_MAX_TRANSACTION_RETRY_TIME,
+    }
+
 
 class Neo4jConnection:
+    """
+    The single, pooled Neo4j driver shared by every router and service.
+    Reads run in managed read transactions and writes in managed write
+    transactions, so transient failures are retried by the driver.
+    """
+
     def __init__(self):
         self.driver = None
         self.uri = settings.NEO4J_URI
         self.user = settings.NEO4J_USER
         self.password = settings.NEO4J_PASSWORD
+        self.query_timeout = settings.NEO4J_QUERY_TIMEOUT
     
     def connect(self):
         """Establish connection to Neo4j"""
         try:
             self.driver = GraphDatabase.driver(
                 self.uri,
-                auth=(self.user, self.password)
+                auth=(self.user, self.password),
+                **_driver_options()
             )
             # Test connection
             self.driver.verify_connectivity()
@@ -27,24 +48,151 @@ class Neo4jConnection:
         if self.driver:
             self.driver.close()
             print("Neo4j connection closed")
+
+    def _query(self, query: str, timeout: float = None) -> Query:
+        return Query(profiled(query), timeout=timeout or self.query_timeout)
+    
+    def _work(self, query: str, parameters: dict, timeout: float):
+        def work(tx):
+            result = tx.run(self._query(query, timeout), parameters or {})
+            records = [record.data() for record in result]
+            return records, result.consume()
+        return work
     
-    def execute_query(self, query: str, parameters: dict = None):
-        """Execute a Cypher query"""
-        with self.driver.session() as session:
-            result = session.run(query, parameters or {})
-            return [record.data() for record in result]
+    def execute_query(self, query: str, parameters: dict = None, timeout: float = None):
+        """Execute a read-only Cypher query in a retried read transaction"""
+        with track(query) as call:
+            with self.driver.session() as session:
+                records, call.summary = session.execute_read(self._work(query, parameters, timeout))
+            call.rows = len(records)
+        return records
+
+    def stream_query(self, query: str, parameters: dict = None, timeout: float = None):
+        """
+        Execute a read-only Cypher query and yield records as they arrive
+        Not retried, since records may already have been handed out.
+        """
+        with track(query) as call:
+            with self.driver.session(default_access_mode=READ_ACCESS) as session:
+                result = session.run(self._query(query, timeout), parameters or {})
+                for record in result:
+                    call.rows += 1
+                    yield record.data()
+                call.summary = result.consume()
     
-    def execute_write(self, query: str, parameters: dict = None):
-        """Execute a write transaction"""
-        with self.driver.session() as session:
-            result = session.execute_write(
-                lambda tx: tx.run(query, parameters or {})
+    def execute_write(self, query: str, parameters: dict = None, timeout: float = None):
+        """Execute a write in a retried write transaction and return its records"""
+        with track(query) as call:
+            with self.driver.session() as session:
+                records, call.summary = session.execute_write(self._work(query, parameters, timeout))
+            call.rows = len(records)
+        return records
+
+    def explain(self, query: str, parameters: dict = None) -> dict:
+        """Plan a query without running it and return the plan tree"""
+        with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            result = session.run("EXPLAIN " + query, parameters or {})
+            return result.consume().plan
+
+
+class AsyncNeo4jConnection:
+    """
+    Async counterpart of Neo4jConnection for `async def` routes.
+    Queries run on the event loop instead of pinning a threadpool thread;
+    a semaphore bounds how many are in flight per worker so bursts queue
+    here rather than on the connection pool.
+    """
+
+    def __init__(self, max_concurrency: int = settings.NEO4J_ASYNC_MAX_CONCURRENCY):
+        self.driver = None
+        self.uri = settings.NEO4J_URI
+        self.user = settings.NEO4J_USER
+        self.password = settings.NEO4J_PASSWORD
+        self.query_timeout = settings.NEO4J_QUERY_TIMEOUT
+        self._limit = asyncio.Semaphore(max_concurrency)
+
+    async def connect(self):
+        """Establish connection to Neo4j"""
+        try:
+            self.driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.user, self.password),
+                **_driver_options()
             )
-            return result
+            await self.driver.verify_connectivity()
+            print("✅ Neo4j async connection successful")
+        except Exception as e:
+            print(f"❌ Neo4j async connection failed: {e}")
+            raise
+
+    async def close(self):
+        """Close the Neo4j connection"""
+        if self.driver:
+            await self.driver.close()
+            print("Neo4j async connection closed")
 
-# Global Neo4j connection instance
-neo4j_conn = Neo4jConnection()
+    def _query(self, query: str, timeout: float = None) -> Query:
+        return Query(profiled(query), timeout=timeout or self.query_timeout)
+
+    def _work(self, query: str, parameters: dict, timeout: float):
+        async def work(tx):
+            result = await tx.run(self._query(query, timeout), parameters or {})
+            records = [record.data() async for record in result]
+            return records, await result.consume()
+        return work
+
+    async def execute_query(self, query: str, parameters: dict = None, timeout: float = None):
+        """Execute a read-only Cypher query in a retried read transaction"""
+        async with self._limit:
+            with track(query) as call:
+                async with self.driver.session() as session:
+                    records, call.summary = await session.execute_read(self._work(query, parameters, timeout))
+                call.rows = len(records)
+        return records
+
+    async def stream_query(self, query: str, parameters: dict = None, timeout: float = None):
+        """Execute a read-only Cypher query and yield records as they arrive"""
+        async with self._limit:
+            with track(query) as call:
+                async with self.driver.session(default_access_mode=READ_ACCESS) as session:
+                    result = await session.run(self._query(query, timeout), parameters or {})
+                    async for record in result:
+                        call.rows += 1
+                        yield record.data()
+                    call.summary = await result.consume()
+
+    async def execute_write(self, query: str, parameters: dict = None, timeout: float = None):
+        """Execute a write in a retried write transaction and return its records"""
+        async with self._limit:
+            with track(query) as call:
+                async with self.driver.session() as session:
+                    records, call.summary = await session.execute_write(self._work(query, parameters, timeout))
+                call.rows = len(records)
+        return records
+
+
+# Global graph connection instances; GRAPH_BACKEND=memory swaps in the
+# embedded read-only graph behind the same interface
+if settings.GRAPH_BACKEND == "memory":
+    from app.core.memory_graph import MemoryGraphConnection, AsyncMemoryGraphConnection
+    neo4j_conn = MemoryGraphConnection()
+    async_neo4j_conn = AsyncMemoryGraphConnection(neo4j_conn)
+else:
+    neo4j_conn = Neo4jConnection()
+    async_neo4j_conn = AsyncNeo4jConnection()
 
 def get_neo4j():
     """Dependency for Neo4j connection"""
     return neo4j_conn
+
+def get_async_neo4j():
+    """Dependency for the async Neo4j connection"""
+    return async_neo4j_conn
+
+def require_writable_graph():
+    """Dependency for routes that write to the graph; rejects them on the read-only memory backend"""
+    if settings.GRAPH_BACKEND == "memory":
+        raise HTTPException(
+            status_code=503,
+            detail="Graph writes are disabled: GRAPH_BACKEND=memory serves a read-only snapshot"
+        )
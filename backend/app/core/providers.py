@@ -0,0 +1,137 @@
+"""
+Lazily built, process-wide shared resources.
+
+Heavy objects (the spaCy model, Neo4jService, the Chroma client) are
+created on first use instead of at import, so workers and --reload
+restarts serve /health immediately. Each resource is built once even when
+several threads ask for it at the same time; lifespan can warm them up in
+the background with STARTUP_WARM_UP.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from fastapi import HTTPException
+from app.core.config import settings
+
+# Reference point for startup timings; this module is imported by app.main
+PROCESS_STARTED = time.monotonic()
+
+
+class LazyResource:
+    """Builds `factory()` on the first get() and shares it afterwards"""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._value = None
+        self._loaded = False
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> Any:
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                started = time.perf_counter()
+                try:
+                    self._value = self.factory()
+                except Exception as e:
+                    # Not cached, so the next call retries
+                    self.error = str(e)
+                    raise
+                self.load_seconds = round(time.perf_counter() - started, 3)
+                self.error = None
+                self._loaded = True
+                print(f"📦 Loaded {self.name} in {self.load_seconds}s")
+        return self._value
+
+    def status(self) -> Dict:
+        return {"name": self.name, "loaded": self._loaded,
+                "load_seconds": self.load_seconds, "error": self.error}
+
+
+def _skill_extractor():
+    from app.core.neo4j_db import neo4j_conn
+    from app.services.job_scraper import JobSkillExtractor
+    from app.services.extraction_cache import extraction_cache
+    from app.services.skill_taxonomy import load_taxonomy
+    extractor = JobSkillExtractor(
+        cache=extraction_cache if settings.EXTRACTION_CACHE_ENABLED else None,
+        taxonomy_loader=lambda: load_taxonomy(neo4j_conn)
+    )
+    # First load happens here, once; later reloads run in the background
+    extractor.taxonomy.refresh(wait=True)
+    return extractor
+
+
+def _neo4j_service():
+    from app.services.neo4j_service import Neo4jService
+    return Neo4jService()
+
+
+def _chroma_client():
+    from app.core.vector_db import get_chroma_client
+    return get_chroma_client()
+
+
+def _posting_scraper():
+    from app.services.job_sources import PostingScraper
+    return PostingScraper.from_settings()
+
+
+skill_extractor = LazyResource("skill_extractor", _skill_extractor)
+neo4j_service = LazyResource("neo4j_service", _neo4j_service)
+chroma_client = LazyResource("chroma_client", _chroma_client)
+posting_scraper = LazyResource("posting_scraper", _posting_scraper)
+
+RESOURCES = [skill_extractor, neo4j_service, chroma_client, posting_scraper]
+
+# Filled in by app.main's lifespan
+startup_timings: Dict[str, float] = {}
+
+
+def warm_up(resources: Optional[List[LazyResource]] = None) -> Dict[str, Optional[float]]:
+    """Load resources now; failures are reported, not raised"""
+    timings = {}
+    for resource in resources or RESOURCES:
+        try:
+            resource.get()
+        except Exception as e:
+            print(f"⚠️  Warm-up of {resource.name} failed: {e}")
+        timings[resource.name] = resource.load_seconds
+    return timings
+
+
+def resource_status() -> Dict:
+    return {
+        "startup": dict(startup_timings),
+        "resources": [resource.status() for resource in RESOURCES],
+    }
+
+
+def _provide(resource: LazyResource):
+    try:
+        return resource.get()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"{resource.name} unavailable: {str(e)}")
+
+
+def get_skill_extractor():
+    """Dependency for the shared JobSkillExtractor"""
+    return _provide(skill_extractor)
+
+
+def get_neo4j_service():
+    """Dependency for the shared Neo4jService"""
+    return _provide(neo4j_service)
+
+
+def get_chroma():
+    """Dependency for the shared Chroma client"""
+    return _provide(chroma_client)
@@ -0,0 +1,167 @@
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+COUNTER_FIELDS = (
+    "nodes_created", "nodes_deleted",
+    "relationships_created", "relationships_deleted",
+    "properties_set", "labels_added", "labels_removed",
+    "indexes_added", "indexes_removed",
+    "constraints_added", "constraints_removed",
+)
+
+# Schema and admin commands can't be prefixed with PROFILE
+_UNPROFILABLE = ("CREATE CONSTRAINT", "CREATE INDEX", "DROP ", "SHOW ", "EXPLAIN", "PROFILE")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and literals so calls of one statement aggregate together"""
+    text = _STRING_LITERAL.sub("?", query)
+    text = _NUMBER_LITERAL.sub("?", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def profiled(query: str) -> str:
+    """Prefix PROFILE when profiling is enabled and the statement allows it"""
+    if not settings.NEO4J_PROFILE_QUERIES:
+        return query
+    if query.lstrip().upper().startswith(_UNPROFILABLE):
+        return query
+    return "PROFILE " + query
+
+
+def _db_hits(plan) -> int:
+    if not plan:
+        return 0
+    hits = plan.get("dbHits", 0) or 0
+    return hits + sum(_db_hits(child) for child in plan.get("children", []))
+
+
+class QueryStats:
+    """
+    Per-statement aggregates of the driver's result summaries, plus a
+    bounded log of statements slower than NEO4J_SLOW_QUERY_MS
+    """
+
+    def __init__(self, slow_ms: float = settings.NEO4J_SLOW_QUERY_MS,
+                 slow_log_path: Optional[str] = settings.NEO4J_SLOW_QUERY_LOG,
+                 slow_log_size: int = 200):
+        self.slow_ms = slow_ms
+        self.slow_log_path = slow_log_path
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+        self._slow = deque(maxlen=slow_log_size)
+
+    def record(self, query: str, elapsed_ms: float, rows: int, summary=None, error: str = None):
+        """Fold one call into the aggregates; `summary` is a neo4j ResultSummary"""
+        key = normalize_query(query)
+        available = (summary.result_available_after or 0) if summary else 0
+        consumed = (summary.result_consumed_after or 0) if summary else 0
+        db_hits = _db_hits(summary.profile) if summary is not None and summary.profile else None
+        counters = {}
+        if summary is not None:
+            counters = {f: getattr(summary.counters, f) for f in COUNTER_FIELDS if getattr(summary.counters, f)}
+
+        with self._lock:
+            entry = self._stats.setdefault(key, {
+                "query": key, "calls": 0, "errors": 0, "rows": 0,
+                "total_ms": 0.0, "max_ms": 0.0,
+                "available_after_ms": 0, "consumed_after_ms": 0,
+                "db_hits": 0, "counters": {},
+            })
+            entry["calls"] += 1
+            entry["rows"] += rows
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["available_after_ms"] += available
+            entry["consumed_after_ms"] += consumed
+            if db_hits:
+                entry["db_hits"] += db_hits
+            if error:
+                entry["errors"] += 1
+            for field, value in counters.items():
+                entry["counters"][field] = entry["counters"].get(field, 0) + value
+
+        if elapsed_ms >= self.slow_ms:
+            self._log_slow({
+                "at": datetime.utcnow().isoformat(),
+                "query": key,
+                "elapsed_ms": round(elapsed_ms, 2),
+                "available_after_ms": available,
+                "consumed_after_ms": consumed,
+                "rows": rows,
+                "db_hits": db_hits,
+                "error": error,
+            })
+
+    def _log_slow(self, entry: Dict):
+        with self._lock:
+            self._slow.append(entry)
+        if self.slow_log_path:
+            try:
+                with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"⚠️  Could not write slow query log: {e}")
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict]:
+        """Aggregated statements, most expensive first"""
+        with self._lock:
+            entries = [dict(e, counters=dict(e["counters"])) for e in self._stats.values()]
+        for e in entries:
+            e["avg_ms"] = round(e["total_ms"] / e["calls"], 2) if e["calls"] else 0.0
+            e["total_ms"] = round(e["total_ms"], 2)
+            e["max_ms"] = round(e["max_ms"], 2)
+        entries.sort(key=lambda e: e.get(order_by) or 0, reverse=True)
+        return entries[:limit]
+
+    def slow_queries(self, limit: int = 50) -> List[Dict]:
+        """Most recent slow statements, newest first"""
+        with self._lock:
+            return list(self._slow)[-limit:][::-1]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+
+
+# Global collector shared by the sync and async Neo4j connections
+query_stats = QueryStats()
+
+
+class _Call:
+    summary = None
+    rows = 0
+
+
+@contextmanager
+def track(query: str):
+    """
+    Time one statement and record it in query_stats on exit.
+    The caller sets `call.summary` and `call.rows` once the result is consumed.
+    """
+    call = _Call()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield call
+    except GeneratorExit:
+        # A streaming consumer stopped early; not a query failure
+        raise
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        query_stats.record(query, elapsed_ms, call.rows, call.summary, error)
@@ -1,26 +1,52 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from app.core.providers import PROCESS_STARTED, posting_scraper, startup_timings, warm_up, resource_status
+from app.core.config import settings
 from app.api.auth import router as auth_router
 from app.api.skills import router as skills_router
-from app.core.neo4j_db import neo4j_conn
+from app.api.admin import router as admin_router
+from app.api.flashcards import router as flashcards_router
+from app.core.neo4j_db import neo4j_conn, async_neo4j_conn
+from app.core.memory_graph import UnsupportedQueryError
+from app.services.analysis_queue import analysis_queue
 from app.api.routes import jobs, flashcards
 
+# Time spent importing the app (routers, services) before lifespan runs
+startup_timings["import_seconds"] = round(time.monotonic() - PROCESS_STARTED, 3)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Connect to Neo4j
     print("🚀 Starting SkillSync API...")
+    started = time.monotonic()
     try:
         neo4j_conn.connect()
+        await async_neo4j_conn.connect()
         print("✅ Neo4j connected")
     except Exception as e:
         print(f"⚠️  Neo4j connection failed: {e}")
+    startup_timings["neo4j_connect_seconds"] = round(time.monotonic() - started, 3)
+
+    if settings.STARTUP_WARM_UP:
+        # Serve requests while the heavy resources load
+        asyncio.get_running_loop().run_in_executor(None, warm_up)
+
+    startup_timings["ready_seconds"] = round(time.monotonic() - PROCESS_STARTED, 3)
+    print(f"✅ Ready in {startup_timings['ready_seconds']}s")
     
     yield
     
     # Shutdown: Close Neo4j connection
     print("🛑 Shutting down SkillSync API...")
+    analysis_queue.shutdown()
+    if posting_scraper.loaded:
+        posting_scraper.get().fetcher.close()
     neo4j_conn.close()
+    await async_neo4j_conn.close()
 
 app = FastAPI(
     title="SkillSync API",
@@ -37,10 +63,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(UnsupportedQueryError)
+async def unsupported_query_handler(request: Request, exc: UnsupportedQueryError):
+    # GRAPH_BACKEND=memory only serves the app's known read queries
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 app.include_router(auth_router)
 app.include_router(skills_router)
+app.include_router(flashcards_router)
 app.include_router(flashcards.router)
 app.include_router(jobs.router)
+app.include_router(admin_router)
 
 
 @app.get("/health")
@@ -50,5 +83,6 @@ def health():
         "databases": {
             "postgresql": "connected",
             "neo4j": "connected" if neo4j_conn.driver else "disconnected"
-        }
+        },
+        **resource_status()
     }
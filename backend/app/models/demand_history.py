@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Index, Integer, String, DateTime, Float
+from datetime import datetime
+from app.core.database import Base
+
+class DemandObservation(Base):
+    """One skill's demand for one job role as measured by one analysis run"""
+    __tablename__ = "demand_observations"
+
+    id = Column(Integer, primary_key=True)
+    job_title = Column(String(200), nullable=False)
+    skill = Column(String(200), nullable=False)
+    demand_percentage = Column(Float, nullable=False)
+    # Postings the run analyzed for this job role
+    postings = Column(Integer)
+    observed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_demand_observations_job_skill", "job_title", "skill", "observed_at"),
+    )
+
+
+class DemandRollup(Base):
+    """Observations of a (job role, skill) aggregated over a day, week or month"""
+    __tablename__ = "demand_rollups"
+
+    # "day", "week" or "month"
+    granularity = Column(String(5), primary_key=True)
+    # Start of the bucket (midnight UTC; Monday for weeks, the 1st for months)
+    bucket_start = Column(DateTime, primary_key=True)
+    job_title = Column(String(200), primary_key=True)
+    skill = Column(String(200), primary_key=True)
+    samples = Column(Integer, nullable=False)
+    demand_sum = Column(Float, nullable=False)
+    demand_min = Column(Float, nullable=False)
+    demand_max = Column(Float, nullable=False)
+    last_demand = Column(Float, nullable=False)
+    last_observed_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_demand_rollups_job", "job_title", "granularity", "bucket_start"),
+    )
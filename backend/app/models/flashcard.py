@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -23,6 +23,14 @@ class Flashcard(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     is_active = Column(Boolean, default=True)
+
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id) within a user, in
+        # the listing's order: newest first, undated cards last. Declared
+        # after the columns it orders by.
+        Index("ix_flashcards_user_created_id", "user_id",
+              created_at.desc().nullslast(), id.desc()),
+    )
     
     # Relationship
     user = relationship("User", back_populates="flashcards")
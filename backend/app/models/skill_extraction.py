@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from datetime import datetime
+from app.core.database import Base
+
+class SkillExtraction(Base):
+    """Cached skills found in one job description, keyed by its content"""
+    __tablename__ = "skill_extractions"
+
+    # sha256 of the normalized description text
+    content_hash = Column(String(64), primary_key=True)
+    # Fingerprint of the skill taxonomy the result was matched against
+    taxonomy_version = Column(String(40), primary_key=True)
+    skills = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class FlashcardBase(BaseModel):
     question: str = Field(..., min_length=1, max_length=1000)
@@ -26,3 +26,7 @@ class FlashcardResponse(FlashcardBase):
     
     class Config:
         from_attributes = True
+
+class FlashcardPage(BaseModel):
+    items: List[FlashcardResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+class SkillIn(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    category: Optional[str] = None
+    difficulty: Optional[str] = None
+    aliases: Optional[List[str]] = None
+
+class PrerequisiteIn(BaseModel):
+    skill: str = Field(..., min_length=1)
+    prerequisite: str = Field(..., min_length=1)
+
+class RequirementIn(BaseModel):
+    job: str = Field(..., min_length=1)
+    skill: str = Field(..., min_length=1)
+    importance: Optional[int] = Field(None, ge=0, le=10)
+
+class SkillImport(BaseModel):
+    skills: List[SkillIn] = []
+    prerequisites: List[PrerequisiteIn] = []
+    requirements: List[RequirementIn] = []
+
+class JobSkillsBatchRequest(BaseModel):
+    job_names: List[str] = Field(..., min_length=1, max_length=100)
+
+class ReadinessRequest(BaseModel):
+    skills: Dict[str, float] = Field(..., description="Skill name -> mastery between 0 and 1")
+    top_k: int = Field(5, ge=1, le=50)
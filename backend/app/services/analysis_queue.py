@@ -0,0 +1,154 @@
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.providers import neo4j_service, posting_scraper, skill_extractor
+from app.services.demand_history import demand_history
+
+
+class QueueFullError(Exception):
+    """Raised when too many analyses are already waiting"""
+
+
+class AnalysisQueue:
+    """
+    In-process queue for scrape-and-analyze runs.
+
+    A bounded thread pool runs `work(job_title)`. Submitting a title that
+    is already queued or running returns the existing job instead of
+    starting another. Finished jobs are kept (up to `keep_finished`) so
+    clients can poll for the result.
+    """
+
+    def __init__(
+        self,
+        work: Callable[[str], Dict],
+        max_workers: int = settings.ANALYSIS_WORKERS,
+        max_pending: int = settings.ANALYSIS_MAX_PENDING,
+        keep_finished: int = settings.ANALYSIS_KEEP_FINISHED
+    ):
+        self.work = work
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._in_flight: Dict[str, str] = {}
+
+    @staticmethod
+    def _key(job_title: str) -> str:
+        return " ".join(job_title.split()).lower()
+
+    def submit(self, job_title: str) -> Tuple[Dict, bool]:
+        """Queue an analysis; returns (job, created) where created=False means deduplicated"""
+        key = self._key(job_title)
+        with self._lock:
+            job_id = self._in_flight.get(key)
+            if job_id:
+                return dict(self._jobs[job_id]), False
+            if len(self._in_flight) >= self.max_pending:
+                raise QueueFullError(f"{len(self._in_flight)} analyses already pending")
+
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "job_title": job_title,
+                "status": "queued",
+                "created_at": datetime.utcnow().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job["job_id"]] = job
+            self._in_flight[key] = job["job_id"]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="analysis")
+            self._executor.submit(self._run, job["job_id"], key)
+            return dict(job), True
+
+    def _run(self, job_id: str, key: str):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = "running"
+            job["started_at"] = datetime.utcnow().isoformat()
+        try:
+            result = self.work(job["job_title"])
+            update = {"status": "done", "result": result}
+        except Exception as e:
+            print(f"❌ Analysis of '{job['job_title']}' failed: {e}")
+            update = {"status": "failed", "error": str(e)}
+
+        with self._lock:
+            job.update(update, finished_at=datetime.utcnow().isoformat())
+            self._in_flight.pop(key, None)
+            self._prune()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"workers": self.max_workers, "max_pending": self.max_pending, **counts}
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def analyze_job_title(job_title: str) -> Dict:
+    """
+    Scrape postings for a title, extract skills and update the knowledge graph
+    Raises (so the job is marked failed) rather than writing an empty skill
+    set when scraping found nothing: that would delete the role's demand.
+    """
+    # Imported here: job_sources pulls in spaCy, which providers load lazily
+    from app.services.job_sources import ScrapeError
+    extractor = skill_extractor.get()
+
+    # Scrape jobs; raises ScrapeError when every source came back empty
+    job_descriptions = posting_scraper.get().scrape(job_title)
+
+    # Extract skills with NLP
+    skills, extraction = extractor.extract_skills_with_stats(job_descriptions)
+    if not skills:
+        raise ScrapeError(f"No skills found in {len(job_descriptions)} postings for '{job_title}'")
+
+    # Update Neo4j knowledge graph
+    neo4j_service.get().update_job_skills(job_title, skills)
+
+    # Near-duplicate reposts were collapsed before counting
+    analyzed = len(job_descriptions) - extraction["duplicates"]
+
+    # Keep this run in the demand history for trend queries
+    if settings.DEMAND_HISTORY_ENABLED:
+        demand_history.record(job_title, skills, postings=analyzed)
+
+    return {
+        "job_title": job_title,
+        "total_jobs_analyzed": analyzed,
+        "duplicates_removed": extraction["duplicates"],
+        "top_skills": skills,
+        "insight": f"Based on {analyzed} real job postings",
+        "extraction": extraction
+    }
+
+
+# Global queue shared by every request in this process
+analysis_queue = AnalysisQueue(analyze_job_title)
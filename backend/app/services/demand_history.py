@@ -0,0 +1,238 @@
+"""
+Time-bucketed history of skill demand per job role.
+
+Every analysis run is stored as raw DemandObservation rows and folded into
+DemandRollup rows for the day, week and month it falls in, with one upsert
+per granularity. Trend and top-mover queries read only the rollups of the
+requested window, grouped by skill and bucket. Their cost depends on the
+window and the number of skills, not on how much history has built up.
+Raw observations are pruned after DEMAND_OBSERVATION_RETENTION_DAYS; the
+rollups are kept.
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.demand_history import DemandObservation, DemandRollup
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Start of the day, week (Monday) or month containing `moment`"""
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown granularity '{granularity}'")
+
+
+def shift_bucket(start: datetime, granularity: str, buckets: int) -> datetime:
+    """The bucket start `buckets` buckets after (or, if negative, before) `start`"""
+    if granularity == "day":
+        return start + timedelta(days=buckets)
+    if granularity == "week":
+        return start + timedelta(weeks=buckets)
+    if granularity == "month":
+        month = start.year * 12 + start.month - 1 + buckets
+        return start.replace(year=month // 12, month=month % 12 + 1)
+    raise ValueError(f"Unknown granularity '{granularity}'")
+
+
+class DemandHistory:
+    """
+    Records analysis runs and answers windowed trend queries over the
+    rollups. Recording is best effort, like the extraction cache: if
+    Postgres is unavailable the run still updates the graph and the
+    failure is counted. Queries raise.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.errors = 0
+
+    def record(self, job_title: str, skills: Dict[str, Dict], postings: Optional[int] = None,
+               observed_at: Optional[datetime] = None):
+        """Store one run's {skill: {demand_percentage, ...}} for a job role"""
+        self.record_many({job_title: skills}, {job_title: postings} if postings is not None else None, observed_at)
+
+    def record_many(self, jobs: Dict[str, Dict[str, Dict]], postings: Optional[Dict[str, int]] = None,
+                    observed_at: Optional[datetime] = None) -> bool:
+        """record() for {job_title: skills}, in one transaction; False if it failed"""
+        if not jobs:
+            return True
+        observed_at = observed_at or datetime.utcnow()
+        try:
+            with self.session_factory() as db:
+                demands = {
+                    title: {skill: data["demand_percentage"] for skill, data in skills.items()}
+                    for title, skills in jobs.items()
+                }
+                # A skill that dropped out of a role is observed at 0 once,
+                # so falling demand shows up in the rollups
+                for title, skill in self._dropped(db, demands, observed_at):
+                    demands[title][skill] = 0.0
+
+                observations = [
+                    {"job_title": title, "skill": skill, "demand_percentage": demand,
+                     "postings": (postings or {}).get(title), "observed_at": observed_at}
+                    for title, skills in demands.items() for skill, demand in skills.items()
+                ]
+                if not observations:
+                    return True
+                db.execute(insert(DemandObservation).values(observations))
+                for granularity in GRANULARITIES:
+                    db.execute(self._rollup(granularity, bucket_start(observed_at, granularity), observations))
+
+                cutoff = observed_at - timedelta(days=settings.DEMAND_OBSERVATION_RETENTION_DAYS)
+                db.query(DemandObservation).filter(DemandObservation.observed_at < cutoff) \
+                    .delete(synchronize_session=False)
+                db.commit()
+            with self._lock:
+                self.recorded += len(observations)
+            return True
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"⚠️  Demand history record failed: {e}")
+            return False
+
+    @staticmethod
+    def _dropped(db, demands: Dict[str, Dict[str, float]], observed_at: datetime) -> List[tuple]:
+        """
+        (job, skill) pairs last seen with demand in this or last month but
+        missing now. Only observations up to `observed_at` count, so an
+        out-of-order backfill isn't compared with data from after it.
+        """
+        since = shift_bucket(bucket_start(observed_at, "month"), "month", -1)
+        rows = db.query(DemandRollup.job_title, DemandRollup.skill, DemandRollup.last_demand,
+                        DemandRollup.last_observed_at).filter(
+            DemandRollup.job_title.in_(list(demands)),
+            DemandRollup.granularity == "month",
+            DemandRollup.bucket_start >= since,
+            DemandRollup.bucket_start <= observed_at,
+            DemandRollup.last_observed_at <= observed_at
+        ).all()
+        latest: Dict[tuple, tuple] = {}
+        for row in rows:
+            key = (row.job_title, row.skill)
+            if key not in latest or row.last_observed_at > latest[key][0]:
+                latest[key] = (row.last_observed_at, row.last_demand)
+        return [key for key, (_, demand) in latest.items() if demand > 0 and key[1] not in demands[key[0]]]
+
+    @staticmethod
+    def _rollup(granularity: str, start: datetime, observations: List[Dict]):
+        rows = [
+            {"granularity": granularity, "bucket_start": start, "job_title": o["job_title"],
+             "skill": o["skill"], "samples": 1, "demand_sum": o["demand_percentage"],
+             "demand_min": o["demand_percentage"], "demand_max": o["demand_percentage"],
+             "last_demand": o["demand_percentage"], "last_observed_at": o["observed_at"]}
+            for o in observations
+        ]
+        stmt = insert(DemandRollup).values(rows)
+        new = stmt.excluded
+        return stmt.on_conflict_do_update(
+            index_elements=["granularity", "bucket_start", "job_title", "skill"],
+            set_={
+                "samples": DemandRollup.samples + new.samples,
+                "demand_sum": DemandRollup.demand_sum + new.demand_sum,
+                "demand_min": func.least(DemandRollup.demand_min, new.demand_min),
+                "demand_max": func.greatest(DemandRollup.demand_max, new.demand_max),
+                "last_demand": case((new.last_observed_at >= DemandRollup.last_observed_at, new.last_demand),
+                                    else_=DemandRollup.last_demand),
+                "last_observed_at": func.greatest(DemandRollup.last_observed_at, new.last_observed_at),
+            }
+        )
+
+    def trends(
+        self,
+        granularity: str = "week",
+        window: int = 8,
+        job_title: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        now: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Per-skill average demand in each of the last `window` buckets,
+        averaged over job roles unless `job_title` is given, with the
+        change from the first to the last bucket that has data
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}'")
+        current = bucket_start(now or datetime.utcnow(), granularity)
+        since = shift_bucket(current, granularity, -(window - 1))
+
+        with self.session_factory() as db:
+            query = db.query(
+                DemandRollup.skill,
+                DemandRollup.bucket_start,
+                func.sum(DemandRollup.demand_sum).label("demand_sum"),
+                func.sum(DemandRollup.samples).label("samples"),
+                func.count(DemandRollup.job_title).label("jobs")
+            ).filter(
+                DemandRollup.granularity == granularity,
+                DemandRollup.bucket_start >= since
+            )
+            if job_title:
+                query = query.filter(DemandRollup.job_title == job_title)
+            if skills:
+                query = query.filter(DemandRollup.skill.in_(skills))
+            rows = query.group_by(DemandRollup.skill, DemandRollup.bucket_start) \
+                .order_by(DemandRollup.skill, DemandRollup.bucket_start).all()
+
+        series: Dict[str, List[Dict]] = {}
+        for row in rows:
+            series.setdefault(row.skill, []).append({
+                "bucket": row.bucket_start.isoformat(),
+                "avg_demand": round(row.demand_sum / row.samples, 1),
+                "samples": row.samples,
+                "jobs": row.jobs,
+            })
+
+        trends = []
+        for skill, points in series.items():
+            first, last = points[0]["avg_demand"], points[-1]["avg_demand"]
+            trends.append({
+                "skill": skill,
+                "start": first,
+                "end": last,
+                "change": round(last - first, 1),
+                "growth_pct": round((last - first) / first * 100, 1) if first else None,
+                "series": points,
+            })
+        return trends
+
+    def top_movers(
+        self,
+        granularity: str = "week",
+        window: int = 4,
+        limit: int = 10,
+        direction: str = "up",
+        job_title: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> List[Dict]:
+        """Skills whose demand rose (direction="up") or fell ("down") most over the window"""
+        movers = [t for t in self.trends(granularity, window, job_title, now=now) if len(t["series"]) > 1]
+        if direction == "up":
+            movers = sorted((t for t in movers if t["change"] > 0), key=lambda t: t["change"], reverse=True)
+        elif direction == "down":
+            movers = sorted((t for t in movers if t["change"] < 0), key=lambda t: t["change"])
+        else:
+            raise ValueError(f"Unknown direction '{direction}'")
+        return movers[:limit]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"recorded": self.recorded, "errors": self.errors}
+
+
+# Global history shared by every request in this process
+demand_history = DemandHistory()
@@ -0,0 +1,87 @@
+import hashlib
+import threading
+from typing import Dict, Iterable, List
+from sqlalchemy.dialects.postgresql import insert
+from app.core.database import SessionLocal
+from app.models.skill_extraction import SkillExtraction
+
+
+def content_hash(text: str) -> str:
+    """Hash of a description with case and whitespace normalized away"""
+    normalized = " ".join(text.split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Persistent per-description skill extraction results in Postgres.
+
+    Rows are keyed by (content hash, taxonomy version), so changing the
+    skill keywords makes every old entry miss without any cleanup.
+    The cache is best effort: if the database is unavailable, lookups
+    miss and stores are skipped.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get_many(self, hashes: Iterable[str], taxonomy_version: str) -> Dict[str, List[str]]:
+        """Cached skills for whichever of `hashes` have been seen"""
+        hashes = list(set(hashes))
+        found: Dict[str, List[str]] = {}
+        if hashes:
+            try:
+                with self.session_factory() as db:
+                    rows = db.query(SkillExtraction.content_hash, SkillExtraction.skills).filter(
+                        SkillExtraction.taxonomy_version == taxonomy_version,
+                        SkillExtraction.content_hash.in_(hashes)
+                    ).all()
+                found = {row.content_hash: row.skills for row in rows}
+            except Exception as e:
+                self._error("lookup", e)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, results: Dict[str, List[str]], taxonomy_version: str):
+        """Store {content hash: skills}; existing entries are left as they are"""
+        if not results:
+            return
+        rows = [
+            {"content_hash": h, "taxonomy_version": taxonomy_version, "skills": sorted(skills)}
+            for h, skills in results.items()
+        ]
+        try:
+            with self.session_factory() as db:
+                db.execute(insert(SkillExtraction).values(rows).on_conflict_do_nothing())
+                db.commit()
+        except Exception as e:
+            self._error("store", e)
+
+    def _error(self, action: str, error: Exception):
+        with self._lock:
+            self.errors += 1
+        print(f"⚠️  Extraction cache {action} failed: {error}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.errors = 0
+
+
+# Global cache shared by every extractor in this process
+extraction_cache = ExtractionCache()
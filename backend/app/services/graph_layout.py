@@ -0,0 +1,84 @@
+from typing import Dict, List, Tuple
+import numpy as np
+
+# Matches the SVG viewport used by the frontend SkillGraph component
+DEFAULT_WIDTH = 900
+DEFAULT_HEIGHT = 600
+
+# Caps the (block x n x 2) displacement tensor used for repulsion
+_BLOCK_ELEMENTS = 2_000_000
+
+
+def force_directed_layout(
+    n: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    iterations: int = 50,
+    seed: int = 42,
+) -> np.ndarray:
+    """
+    Fruchterman-Reingold layout in the unit square, vectorized with NumPy.
+    Returns an (n, 2) array of positions. A fixed seed keeps the layout
+    stable between rebuilds of the same graph.
+    """
+    if n == 0:
+        return np.zeros((0, 2))
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    if n == 1:
+        return np.full((1, 2), 0.5)
+
+    k = np.sqrt(1.0 / n)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    block = max(1, _BLOCK_ELEMENTS // n)
+
+    for _ in range(iterations):
+        disp = np.zeros((n, 2))
+
+        # Repulsion between every pair, computed in row blocks to bound memory
+        for start in range(0, n, block):
+            delta = pos[start:start + block, None, :] - pos[None, :, :]
+            dist2 = np.maximum((delta ** 2).sum(axis=-1), 1e-9)
+            disp[start:start + block] += (delta * (k * k / dist2)[..., None]).sum(axis=1)
+
+        # Attraction along edges
+        if len(sources):
+            delta = pos[sources] - pos[targets]
+            dist = np.maximum(np.linalg.norm(delta, axis=1), 1e-9)
+            force = delta * (dist / k)[:, None]
+            np.add.at(disp, sources, -force)
+            np.add.at(disp, targets, force)
+
+        length = np.maximum(np.linalg.norm(disp, axis=1), 1e-9)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    # Normalize into the unit square
+    pos -= pos.min(axis=0)
+    span = pos.max(axis=0)
+    span[span == 0] = 1.0
+    return pos / span
+
+
+def layout_positions(
+    n: int,
+    links: List[Dict],
+    iterations: int = 50,
+    width: int = DEFAULT_WIDTH,
+    height: int = DEFAULT_HEIGHT,
+    margin: int = 40,
+) -> List[Tuple[float, float]]:
+    """
+    (x, y) in the SVG viewport for each of `n` nodes.
+    Links must reference nodes by their position, as build_skill_graph
+    produces them.
+    """
+    sources = np.array([link["source"] for link in links], dtype=np.int64)
+    targets = np.array([link["target"] for link in links], dtype=np.int64)
+    pos = force_directed_layout(n, sources, targets, iterations)
+
+    xs = margin + pos[:, 0] * (width - 2 * margin)
+    ys = margin + pos[:, 1] * (height - 2 * margin)
+    return [(round(x, 1), round(y, 1)) for x, y in zip(xs.tolist(), ys.tolist())]
+
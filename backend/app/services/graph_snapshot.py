@@ -0,0 +1,328 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.graph_layout import layout_positions
+
+SKILL_GRAPH_QUERY = """
+MATCH (s:Skill)
+OPTIONAL MATCH (s)-[r:PREREQUISITE]->(s2:Skill)
+RETURN s.name as skill, s.category as category, s.difficulty as difficulty,
+       COLLECT({target: s2.name, relationship: type(r)}) as connections
+ORDER BY skill
+"""
+
+
+def build_skill_graph(neo4j) -> Dict:
+    """
+    Query Neo4j and format the skill graph for a D3.js force-directed graph
+    """
+    results = neo4j.execute_query(SKILL_GRAPH_QUERY)
+
+    nodes = []
+    links = []
+    node_map = {}
+
+    # Create nodes
+    for i, record in enumerate(results):
+        node_map[record['skill']] = i
+        nodes.append({
+            "id": i,
+            "name": record['skill'],
+            "category": record['category'],
+            "difficulty": record['difficulty']
+        })
+
+    # Create links from connections, in a fixed order so every worker
+    # serializes the same graph to the same bytes
+    for i, record in enumerate(results):
+        for conn in sorted(record['connections'], key=lambda c: (c['target'] is None, c['target'] or "")):
+            if conn['target'] and conn['target'] in node_map:
+                links.append({
+                    "source": i,
+                    "target": node_map[conn['target']],
+                    "type": conn['relationship']
+                })
+
+    return {
+        "nodes": nodes,
+        "links": links,
+        "stats": {
+            "total_skills": len(nodes),
+            "total_connections": len(links)
+        }
+    }
+
+
+SKILL_NODES_QUERY = """
+MATCH (s:Skill)
+RETURN s.name as name, s.category as category, s.difficulty as difficulty
+"""
+
+SKILL_LINKS_QUERY = """
+MATCH (s:Skill)-[r:PREREQUISITE]->(s2:Skill)
+RETURN s.name as source, s2.name as target, type(r) as type
+"""
+
+
+async def aiter_skill_graph(neo4j) -> AsyncIterator[Dict]:
+    """
+    Yield the skill graph one item at a time from an AsyncNeo4jConnection:
+    every node, then every link, then a stats record. Nodes are keyed by
+    name so links can be emitted without holding an id map in memory.
+    """
+    total_skills = 0
+    async for record in neo4j.stream_query(SKILL_NODES_QUERY):
+        total_skills += 1
+        yield {"node": {"id": record["name"], **record}}
+
+    total_connections = 0
+    async for record in neo4j.stream_query(SKILL_LINKS_QUERY):
+        total_connections += 1
+        yield {"link": record}
+
+    yield {"stats": {"total_skills": total_skills, "total_connections": total_connections}}
+
+
+def _ndjson(item: Dict) -> bytes:
+    return json.dumps(item, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+async def andjson_lines(items: AsyncIterable[Dict]) -> AsyncIterator[bytes]:
+    """Encode an async stream of items as newline-delimited JSON"""
+    async for item in items:
+        yield _ndjson(item)
+
+
+def structure_key(graph: Dict) -> str:
+    """Hash of the node names and links a layout depends on"""
+    names = [node["name"] for node in graph["nodes"]]
+    links = [(link["source"], link["target"]) for link in graph["links"]]
+    return hashlib.sha1(json.dumps([names, links]).encode("utf-8")).hexdigest()
+
+
+class LayoutCache:
+    """
+    Node positions per graph structure, computed on a background thread.
+
+    Layout is O(n²) per iteration, so it never runs on the request path.
+    Positions are keyed by structure_key, so rebuilds after a bump or TTL
+    expiry that didn't add or remove nodes or links reuse them at once.
+    Graphs above `max_nodes` aren't laid out; the client does it.
+    """
+
+    def __init__(
+        self,
+        iterations: int = settings.GRAPH_LAYOUT_ITERATIONS,
+        max_nodes: int = settings.GRAPH_LAYOUT_MAX_NODES,
+        keep: int = 8
+    ):
+        self.iterations = iterations
+        self.max_nodes = max_nodes
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._positions: "OrderedDict[str, List[Tuple[float, float]]]" = OrderedDict()
+        self._pending = set()
+
+    def enabled_for(self, graph: Dict) -> bool:
+        return self.iterations > 0 and 0 < len(graph["nodes"]) <= self.max_nodes
+
+    def get(self, key: str) -> Optional[List[Tuple[float, float]]]:
+        with self._lock:
+            positions = self._positions.get(key)
+            if positions is not None:
+                self._positions.move_to_end(key)
+            return positions
+
+    def schedule(self, key: str, graph: Dict, on_done: Callable[[str, List[Tuple[float, float]]], None]):
+        """Lay `graph` out in the background unless that structure already is being"""
+        with self._lock:
+            if key in self._pending or key in self._positions:
+                return
+            self._pending.add(key)
+        n, links = len(graph["nodes"]), [dict(link) for link in graph["links"]]
+        threading.Thread(target=self._run, args=(key, n, links, on_done),
+                         name="graph-layout", daemon=True).start()
+
+    def _run(self, key: str, n: int, links: List[Dict], on_done):
+        started = time.perf_counter()
+        try:
+            positions = layout_positions(n, links, self.iterations)
+        except Exception as e:
+            print(f"⚠️  Graph layout failed: {e}")
+            return
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+        with self._lock:
+            self._positions[key] = positions
+            while len(self._positions) > self.keep:
+                self._positions.popitem(last=False)
+        print(f"🗺️  Laid out {n} nodes in {time.perf_counter() - started:.2f}s")
+        on_done(key, positions)
+
+
+class SkillGraphSnapshot:
+    """
+    Process-level cache of the serialized skill graph.
+
+    Every write to the graph calls `bump()`, which increments `version`.
+    The next read rebuilds the payload once, and later reads are served
+    from memory until the version changes again. Other workers
+    don't see this process's bumps, so snapshots also expire after
+    GRAPH_SNAPSHOT_TTL_SECONDS.
+
+    Node x/y positions come from a LayoutCache. A structure that hasn't
+    been laid out yet is served without positions while the layout runs
+    in the background; the payload is then re-serialized with them.
+    """
+
+    def __init__(self, ttl_seconds: int = settings.GRAPH_SNAPSHOT_TTL_SECONDS,
+                 layouts: Optional[LayoutCache] = None):
+        self.ttl_seconds = ttl_seconds
+        self.layouts = layouts or LayoutCache()
+        self.version = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._built_version: Optional[int] = None
+        self._built_at = 0.0
+        self._payload: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._graph: Optional[Dict] = None
+        self._layout_key: Optional[str] = None
+
+    def bump(self) -> int:
+        """Mark the graph as changed and return the new version"""
+        with self._lock:
+            self.version += 1
+            return self.version
+
+    def _is_fresh(self) -> bool:
+        if self._payload is None or self._built_version != self.version:
+            return False
+        if self.ttl_seconds and time.monotonic() - self._built_at > self.ttl_seconds:
+            return False
+        return True
+
+    def peek(self) -> Optional[Tuple[bytes, str]]:
+        """Return (json_payload, etag) if the snapshot is fresh, without touching Neo4j"""
+        with self._lock:
+            if self._is_fresh():
+                return self._payload, self._etag
+        return None
+
+    def get(self, neo4j) -> Tuple[bytes, str]:
+        """Return (json_payload, etag), rebuilding from Neo4j if stale"""
+        with self._lock:
+            if self._is_fresh():
+                return self._payload, self._etag
+
+        # Only one request rebuilds; concurrent readers wait for its result
+        with self._build_lock:
+            with self._lock:
+                if self._is_fresh():
+                    return self._payload, self._etag
+                version = self.version
+
+            graph = build_skill_graph(neo4j)
+            key = None
+            if self.layouts.enabled_for(graph):
+                key = structure_key(graph)
+                positions = self.layouts.get(key)
+                if positions is not None:
+                    _place(graph, positions)
+            payload, etag = _serialize(graph)
+
+            with self._lock:
+                # A write during the rebuild leaves version ahead of
+                # _built_version, so the next read rebuilds again
+                self._payload = payload
+                self._etag = etag
+                self._graph = graph
+                self._layout_key = key
+                self._built_version = version
+                self._built_at = time.monotonic()
+
+            if key is not None and positions is None:
+                self.layouts.schedule(key, graph, self._layout_done)
+            return payload, etag
+
+    def _layout_done(self, key: str, positions: List[Tuple[float, float]]):
+        # Only the snapshot the layout was started for gets the positions
+        with self._lock:
+            if self._layout_key != key or self._graph is None:
+                return
+            graph = {**self._graph, "nodes": [dict(node) for node in self._graph["nodes"]]}
+            _place(graph, positions)
+            self._graph = graph
+            self._payload, self._etag = _serialize(graph)
+
+
+def _place(graph: Dict, positions: List[Tuple[float, float]]):
+    for node, (x, y) in zip(graph["nodes"], positions):
+        node["x"] = x
+        node["y"] = y
+
+
+def _serialize(graph: Dict) -> Tuple[bytes, str]:
+    # The ETag hashes graph content only, never the process-local version,
+    # so all workers agree on it and a bump that changed nothing keeps it
+    payload = json.dumps(graph, separators=(",", ":")).encode("utf-8")
+    return payload, f'"{hashlib.sha1(payload).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+# Global snapshot shared by every request in this process
+graph_snapshot = SkillGraphSnapshot()
+
+
+class GraphDerivedCache:
+    """
+    Holds an in-memory structure derived from the graph (indexes, matrices)
+    and rebuilds it with `build(neo4j)` whenever graph_snapshot.version
+    changes or the TTL expires
+    """
+
+    def __init__(self, build: Callable[[Any], Any], ttl_seconds: int = settings.GRAPH_SNAPSHOT_TTL_SECONDS):
+        self.build = build
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._value = None
+        self._version: Optional[int] = None
+        self._built_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        if self._value is None or self._version != graph_snapshot.version:
+            return False
+        if self.ttl_seconds and time.monotonic() - self._built_at > self.ttl_seconds:
+            return False
+        return True
+
+    def get(self, neo4j):
+        if self._is_fresh():
+            return self._value
+        with self._lock:
+            if self._is_fresh():
+                return self._value
+            version = graph_snapshot.version
+            self._value = self.build(neo4j)
+            self._version = version
+            self._built_at = time.monotonic()
+            return self._value
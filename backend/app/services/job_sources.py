@@ -0,0 +1,374 @@
+"""
+Pluggable job-posting sources over a pooled, polite HTTP fetcher.
+
+HttpFetcher keeps one pooled requests.Session and fetches pages on a
+thread pool. Concurrency and request spacing are limited per host, and
+pages are revalidated against a local PageCache with If-None-Match /
+If-Modified-Since, so unchanged pages cost a 304 instead of a download.
+Response bodies are fed to an incremental HTML parser as they arrive
+instead of being buffered and parsed afterwards. Pages that declare no
+charset are decoded with the encoding detected from their first chunk
+(UTF-8 if nothing is detected), not requests' ISO-8859-1 default.
+
+Sources are selected with JOB_SOURCES (comma separated):
+  mock  the built-in sample postings
+  html  pages from JOB_SOURCE_URL_TEMPLATE, e.g.
+        http://localhost:8001/jobs?q={query}&page={page}, one posting per
+        element matching JOB_SOURCE_ITEM_SELECTOR ("div.job-description")
+"""
+import abc
+import codecs
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote_plus, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from app.core.config import settings
+from app.services.job_scraper import SAMPLE_JOBS
+
+
+class ScrapeError(Exception):
+    """Raised when a source, or every source, produced no postings"""
+
+
+class PageCache:
+    """
+    Validators and bodies of fetched pages in a local directory:
+    <sha256(url)>.json holds ETag/Last-Modified, <sha256(url)>.body the bytes
+    """
+
+    def __init__(self, directory: str = settings.PAGE_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str, ext: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ext)
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a cached page, if any"""
+        try:
+            with open(self._path(url, ".json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not os.path.exists(self._path(url, ".body")):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def body(self, url: str) -> bytes:
+        with open(self._path(url, ".body"), "rb") as f:
+            return f.read()
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes, encoding: str):
+        # Body first, so validators never point at a missing body
+        tmp = self._path(url, ".body.tmp")
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, self._path(url, ".body"))
+        tmp = self._path(url, ".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified, "encoding": encoding}, f)
+        os.replace(tmp, self._path(url, ".json"))
+
+    def encoding(self, url: str) -> str:
+        try:
+            with open(self._path(url, ".json"), encoding="utf-8") as f:
+                return json.load(f).get("encoding") or "utf-8"
+        except (OSError, ValueError):
+            return "utf-8"
+
+
+class _HostLimit:
+    """At most `concurrency` requests in flight and `min_interval` s between starts"""
+
+    def __init__(self, concurrency: int, min_interval: float):
+        self.slots = threading.Semaphore(concurrency)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait_turn(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class HttpFetcher:
+    """Pooled, per-host limited GETs with conditional revalidation"""
+
+    def __init__(
+        self,
+        cache: Optional[PageCache] = None,
+        max_workers: int = settings.FETCH_MAX_WORKERS,
+        per_host: int = settings.FETCH_PER_HOST,
+        min_interval: float = settings.FETCH_MIN_INTERVAL,
+        timeout: float = settings.FETCH_TIMEOUT,
+        chunk_size: int = 16384
+    ):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = settings.FETCH_USER_AGENT
+        self._hosts: Dict[str, _HostLimit] = {}
+        self._hosts_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def _host(self, url: str) -> _HostLimit:
+        host = urlsplit(url).netloc
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = _HostLimit(self.per_host, self.min_interval)
+            return self._hosts[host]
+
+    def fetch(self, url: str, feed: Callable[[str], None]) -> Dict:
+        """
+        GET `url`, passing decoded text to `feed` as it streams in (or the
+        cached body on 304). Returns {url, status, cached, bytes}.
+        A 304 with no cached body to serve counts as a miss: the page is
+        requested again without validators.
+        """
+        headers = self.cache.validators(url) if self.cache else {}
+        limit = self._host(url)
+        with limit.slots:
+            limit.wait_turn()
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            if response.status_code == 304:
+                response.close()
+                body = self._cached_body(url) if headers else None
+                if body is not None:
+                    feed(body.decode(self.cache.encoding(url), errors="replace"))
+                    return {"url": url, "status": 304, "cached": True, "bytes": 0}
+                limit.wait_turn()
+                response = self.session.get(url, headers={"Cache-Control": "no-cache"},
+                                            timeout=self.timeout, stream=True)
+            with response:
+                if response.status_code == 304:
+                    raise requests.HTTPError(f"304 Not Modified for unconditional GET {url}", response=response)
+                response.raise_for_status()
+
+                encoding = _declared_encoding(response)
+                decoder = None
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                keep = self.cache is not None and (etag or last_modified)
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(self.chunk_size):
+                    if not chunk:
+                        continue
+                    if decoder is None:
+                        encoding = encoding or _detect_encoding(chunk)
+                        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+                    size += len(chunk)
+                    if keep:
+                        chunks.append(chunk)
+                    feed(decoder.decode(chunk))
+                if decoder is not None:
+                    feed(decoder.decode(b"", final=True))
+                encoding = encoding or "utf-8"
+
+        if keep:
+            self.cache.store(url, etag, last_modified, b"".join(chunks), encoding)
+        return {"url": url, "status": response.status_code, "cached": False, "bytes": size}
+
+    def _cached_body(self, url: str) -> Optional[bytes]:
+        try:
+            return self.cache.body(url)
+        except OSError:
+            return None
+
+    def fetch_all(self, urls: List[str], make_feed: Callable[[str], Callable[[str], None]]) -> List[Dict]:
+        """Fetch many URLs concurrently; failures are reported per URL, not raised"""
+        def one(url):
+            try:
+                return self.fetch(url, make_feed(url))
+            except requests.RequestException as e:
+                return {"url": url, "status": None, "cached": False, "bytes": 0, "error": str(e)}
+        return list(self._executor.map(one, urls))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+def _declared_encoding(response) -> Optional[str]:
+    """The charset from Content-Type, or None if the server didn't send one"""
+    # requests reports ISO-8859-1 for any text/* response without a charset
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        return None
+    try:
+        return codecs.lookup(response.encoding).name
+    except (LookupError, TypeError):
+        return None
+
+
+def _detect_encoding(chunk: bytes) -> str:
+    """What response.apparent_encoding would say, from the first chunk only"""
+    detected = chardet.detect(chunk).get("encoding") if chardet else None
+    try:
+        name = codecs.lookup(detected).name if detected else "utf-8"
+    except LookupError:
+        return "utf-8"
+    # A pure-ASCII start says nothing about the rest of the page
+    return "utf-8" if name == "ascii" else name
+
+
+class PostingParser(HTMLParser):
+    """
+    Incremental parser collecting the text of every <tag class="...">
+    element; feed() may be called with partial documents
+    """
+
+    def __init__(self, tag: str, css_class: Optional[str] = None):
+        super().__init__(convert_charrefs=True)
+        self.tag = tag
+        self.css_class = css_class
+        self.postings: List[str] = []
+        self._depth = 0
+        self._parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._depth:
+            if tag == self.tag:
+                self._depth += 1
+            return
+        if tag != self.tag:
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        if self.css_class is None or self.css_class in classes:
+            self._depth = 1
+            self._parts = []
+
+    def handle_endtag(self, tag):
+        if self._depth and tag == self.tag:
+            self._depth -= 1
+            if not self._depth:
+                text = " ".join("".join(self._parts).split())
+                if text:
+                    self.postings.append(text)
+
+    def handle_data(self, data):
+        if self._depth:
+            self._parts.append(data)
+
+
+class JobSource(abc.ABC):
+    """A place job postings come from"""
+    name = "source"
+
+    @abc.abstractmethod
+    def fetch(self, job_title: str, fetcher: HttpFetcher, limit: Optional[int] = None) -> List[str]:
+        """Up to `limit` posting texts for `job_title`"""
+
+
+class MockSource(JobSource):
+    """The built-in sample postings"""
+    name = "mock"
+
+    def fetch(self, job_title: str, fetcher: HttpFetcher, limit: Optional[int] = None) -> List[str]:
+        postings = SAMPLE_JOBS.get(job_title, SAMPLE_JOBS["ML Engineer"])
+        return postings[:limit] if limit else list(postings)
+
+
+class HtmlListingSource(JobSource):
+    """Paged HTML listings where each matching element is one posting"""
+    name = "html"
+
+    def __init__(self, url_template: str, selector: str = "div.job-description", pages: int = 5):
+        self.url_template = url_template
+        self.tag, _, css_class = selector.partition(".")
+        self.css_class = css_class or None
+        self.pages = pages
+
+    def fetch(self, job_title: str, fetcher: HttpFetcher, limit: Optional[int] = None) -> List[str]:
+        urls = [self.url_template.format(query=quote_plus(job_title), page=page)
+                for page in range(1, self.pages + 1)]
+        parsers: Dict[str, PostingParser] = {}
+
+        def make_feed(url):
+            parsers[url] = PostingParser(self.tag, self.css_class)
+            return parsers[url].feed
+
+        results = fetcher.fetch_all(urls, make_feed)
+        failed = [result for result in results if result.get("error")]
+        for result in failed:
+            print(f"⚠️  {result['url']}: {result['error']}")
+        # Skipping some failed pages is fine; losing all of them is an outage
+        if results and len(failed) == len(results):
+            raise ScrapeError(f"All {len(results)} pages failed, last: {failed[-1]['error']}")
+
+        postings = []
+        for url in urls:
+            parser = parsers.get(url)
+            if parser:
+                parser.close()
+                postings.extend(parser.postings)
+        return postings[:limit] if limit else postings
+
+
+def build_sources() -> List[JobSource]:
+    """Sources named in JOB_SOURCES"""
+    sources = []
+    for name in (n.strip() for n in settings.JOB_SOURCES.split(",") if n.strip()):
+        if name == "mock":
+            sources.append(MockSource())
+        elif name == "html":
+            if not settings.JOB_SOURCE_URL_TEMPLATE:
+                raise ValueError("JOB_SOURCES includes html but JOB_SOURCE_URL_TEMPLATE is not set")
+            sources.append(HtmlListingSource(settings.JOB_SOURCE_URL_TEMPLATE,
+                                             settings.JOB_SOURCE_ITEM_SELECTOR, settings.JOB_SOURCE_PAGES))
+        else:
+            raise ValueError(f"Unknown job source '{name}'")
+    return sources
+
+
+class PostingScraper:
+    """Collects postings for a job title from every configured source"""
+
+    def __init__(self, sources: List[JobSource], fetcher: HttpFetcher):
+        self.sources = sources
+        self.fetcher = fetcher
+
+    @classmethod
+    def from_settings(cls) -> "PostingScraper":
+        return cls(build_sources(), HttpFetcher(PageCache()))
+
+    def scrape(self, job_title: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Postings from every source. A source that fails is skipped while
+        another one returns postings; raises ScrapeError if none does.
+        """
+        postings = []
+        errors = []
+        for source in self.sources:
+            try:
+                postings.extend(source.fetch(job_title, self.fetcher, limit))
+            except (ScrapeError, requests.RequestException) as e:
+                print(f"⚠️  {source.name} source failed for '{job_title}': {e}")
+                errors.append(f"{source.name}: {e}")
+        if not postings:
+            detail = "; ".join(errors) if errors else "sources returned nothing"
+            raise ScrapeError(f"No postings found for '{job_title}' ({detail})")
+        return postings
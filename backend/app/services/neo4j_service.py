@@ -1,102 +1,309 @@
-from neo4j import GraphDatabase
-from typing import Dict, List
-import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
+from app.core.config import settings
+from app.core.neo4j_db import Neo4jConnection, AsyncNeo4jConnection, neo4j_conn, async_neo4j_conn
+from app.services.graph_snapshot import graph_snapshot
+
+# Labels and relationship types that carry updated_at stamps for graph deltas
+DELTA_NODE_LABELS = ("Skill", "JobRole")
+DELTA_RELATIONSHIP_TYPES = ("REQUIRES", "DEMANDS", "PREREQUISITE")
+
+NOW_QUERY = "RETURN timestamp() as now"
+
+GRAPH_NODES_QUERY = """
+MATCH (n)
+WHERE (n)--()
+RETURN elementId(n) as id, n.name as name, labels(n)[0] as type
+"""
+
+GRAPH_LINKS_QUERY = """
+MATCH (n)-[r]->(m)
+RETURN elementId(r) as id, elementId(n) as source,
+       elementId(m) as target, type(r) as type
+"""
+
+CHANGED_NODES_QUERY = """
+MATCH (n:{label})
+WHERE n.updated_at > $since
+RETURN elementId(n) as id, n.name as name, labels(n)[0] as type
+"""
+
+CHANGED_LINKS_QUERY = """
+MATCH (n)-[r:{rel_type}]->(m)
+WHERE r.updated_at > $since
+RETURN elementId(r) as id, elementId(n) as source,
+       elementId(m) as target, type(r) as type
+"""
+
+REMOVED_QUERY = """
+MATCH (t:GraphTombstone)
+WHERE t.removed_at > $since
+RETURN t.element_id as id, t.kind as kind
+"""
+
+JOB_SKILLS_QUERY = """
+MATCH (j:JobRole {name: $job_role})-[r:DEMANDS]->(s:Skill)
+RETURN s.name as skill, 
+       r.demand_percentage as demand,
+       r.priority as priority
+ORDER BY r.demand_percentage DESC
+"""
+
+# Reads the per-skill aggregates maintained by update_job_skills; the
+# (demand_job_count, demand_avg) index serves the ordering
+TRENDING_SKILLS_QUERY = """
+MATCH (s:Skill)
+WHERE s.demand_job_count > 0 AND s.demand_avg IS NOT NULL
+  AND (size($categories) = 0 OR s.category IN $categories)
+RETURN s.name as skill,
+       s.category as category,
+       s.demand_job_count as job_count,
+       s.demand_avg as avg_demand,
+       toString(s.demand_updated_at) as updated_at
+ORDER BY s.demand_job_count DESC, s.demand_avg DESC
+LIMIT $limit
+"""
+
+# One row per job role: {title, skills: [{name, demand, priority}]}
+UPDATE_JOB_SKILLS_QUERY = """
+UNWIND $jobs AS job
+CALL {
+    WITH job
+    MERGE (j:JobRole {name: job.title})
+    ON CREATE SET j.demand_score = 0
+    SET j.updated_at = datetime()
+    WITH j, job
+    CALL {
+        WITH j, job
+        MATCH (j)-[old:DEMANDS]->(gone:Skill)
+        WHERE NOT gone.name IN [skill IN job.skills | skill.name]
+        SET gone.demand_job_count = gone.demand_job_count - 1,
+            gone.demand_sum = gone.demand_sum - coalesce(old.demand_percentage, 0),
+            gone.demand_updated_at = datetime()
+        SET gone.demand_avg = CASE WHEN gone.demand_job_count > 0
+                                   THEN toFloat(gone.demand_sum) / gone.demand_job_count END
+        CREATE (:GraphTombstone {element_id: elementId(old), kind: 'link', removed_at: datetime()})
+        DELETE old
+        RETURN count(*) as removed
+    }
+    WITH j, job
+    UNWIND job.skills AS skill
+    MERGE (s:Skill {name: skill.name})
+    ON CREATE SET s.updated_at = datetime()
+    WITH j, s, skill
+    OPTIONAL MATCH (j)-[prev:DEMANDS]->(s)
+    WITH j, s, skill, prev IS NOT NULL as existed, coalesce(prev.demand_percentage, 0) as previous
+    MERGE (j)-[r:DEMANDS]->(s)
+    SET r.demand_percentage = skill.demand,
+        r.priority = skill.priority,
+        r.updated_at = datetime(),
+        s.demand_job_count = coalesce(s.demand_job_count, 0) + CASE WHEN existed THEN 0 ELSE 1 END,
+        s.demand_sum = coalesce(s.demand_sum, 0) - previous + skill.demand,
+        s.demand_updated_at = datetime()
+    SET s.demand_avg = toFloat(s.demand_sum) / s.demand_job_count
+}
+"""
+
+
+def is_beyond_retention(since: datetime) -> bool:
+    """True if tombstones for changes since `since` may already be pruned"""
+    retention = settings.GRAPH_TOMBSTONE_RETENTION_DAYS * 86400
+    return (datetime.now(timezone.utc) - since).total_seconds() > retention
+
+
+def collect_graph(items) -> Dict:
+    """Gather iter_skill_graph / iter_graph_changes items into one payload"""
+    graph = {"nodes": [], "links": []}
+    for item in items:
+        if "node" in item:
+            graph["nodes"].append(item["node"])
+        elif "link" in item:
+            graph["links"].append(item["link"])
+        elif "removed" in item:
+            graph.setdefault("removed", []).append(item["removed"])
+        elif "full" in item:
+            graph["full"] = item["full"]
+        else:
+            graph["as_of"] = item["as_of"]
+    return graph
+
+
+def parse_since(since: Union[str, int]) -> datetime:
+    """Parse a delta token: epoch milliseconds (as returned in as_of) or ISO 8601"""
+    if isinstance(since, int) or str(since).isdigit():
+        return datetime.fromtimestamp(int(since) / 1000, tz=timezone.utc)
+    parsed = datetime.fromisoformat(str(since).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
 
 class Neo4jService:
-    def __init__(self):
-        uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-        user = os.getenv("NEO4J_USER", "neo4j")
-        password = os.getenv("NEO4J_PASSWORD", "password")
-        
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
-    
-    def close(self):
-        self.driver.close()
+    """Job market operations on the knowledge graph, over the shared driver"""
+
+    def __init__(self, conn: Neo4jConnection = neo4j_conn):
+        self.conn = conn
+
+    def _now(self) -> int:
+        return self.conn.execute_query(NOW_QUERY)[0]["now"]
     
     def update_job_skills(self, job_title: str, skills: Dict):
-        """Create/update JobRole -> DEMANDS -> Skill relationships"""
-        skill_list = [
-            {"name": name, "demand": data["demand_percentage"], "priority": data["priority"]}
-            for name, data in skills.items()
+        """
+        Create/update JobRole -> DEMANDS -> Skill relationships
+        DEMANDS edges to skills missing from this analysis are removed and
+        leave a GraphTombstone so graph deltas can report the removal.
+        Each Skill's demand_job_count / demand_sum / demand_avg aggregates
+        are adjusted in the same transaction for get_trending_skills.
+        """
+        self.update_many_job_skills({job_title: skills})
+
+    def update_many_job_skills(self, jobs: Dict[str, Dict], batch_size: int = 100):
+        """update_job_skills for {job_title: skills}, batch_size roles per write transaction"""
+        rows = [
+            {
+                "title": title,
+                "skills": [
+                    {"name": name, "demand": data["demand_percentage"], "priority": data["priority"]}
+                    for name, data in skills.items()
+                ],
+            }
+            for title, skills in jobs.items()
         ]
-        
-        with self.driver.session() as session:
-            session.run("""
-                MERGE (j:JobRole {name: $job_title})
-                WITH j
-                UNWIND $skills AS skill
-                MERGE (s:Skill {name: skill.name})
-                MERGE (j)-[r:DEMANDS]->(s)
-                SET r.demand_percentage = skill.demand,
-                    r.priority = skill.priority,
-                    r.updated_at = datetime()
-            """, job_title=job_title, skills=skill_list)
+        for start in range(0, len(rows), batch_size):
+            self.conn.execute_write(UPDATE_JOB_SKILLS_QUERY, {"jobs": rows[start:start + batch_size]})
+
+        # Tombstones only need to outlive the oldest delta a client may ask for
+        self.conn.execute_write("""
+                MATCH (t:GraphTombstone)
+                WHERE t.removed_at < datetime() - duration({days: $days})
+                DELETE t
+            """, {"days": settings.GRAPH_TOMBSTONE_RETENTION_DAYS})
+
+        # MERGE may have created new Skill nodes
+        graph_snapshot.bump()
     
+    def iter_skill_graph(self) -> Iterator[Dict]:
+        """
+        Yield the complete graph one item at a time: nodes that take part
+        in any relationship first, then the relationships themselves
+        """
+        for record in self.conn.stream_query(GRAPH_NODES_QUERY):
+            yield {"node": record}
+        for record in self.conn.stream_query(GRAPH_LINKS_QUERY):
+            yield {"link": record}
+
+    def iter_graph_changes(self, since: datetime) -> Iterator[Dict]:
+        """
+        Yield nodes and links stamped after `since`, then removals, then
+        an {"as_of": ...} token to pass as `since` on the next poll.
+        Items are keyed by elementId, as in iter_skill_graph.
+        """
+        # Taken first so changes committed while we read are re-sent next time
+        as_of = self._now()
+        params = {"since": since}
+        for label in DELTA_NODE_LABELS:
+            for record in self.conn.stream_query(CHANGED_NODES_QUERY.format(label=label), params):
+                yield {"node": record}
+        for rel_type in DELTA_RELATIONSHIP_TYPES:
+            for record in self.conn.stream_query(CHANGED_LINKS_QUERY.format(rel_type=rel_type), params):
+                yield {"link": record}
+        for record in self.conn.stream_query(REMOVED_QUERY, params):
+            yield {"removed": record}
+        yield {"as_of": as_of}
+
+    def iter_graph_delta(self, since: datetime) -> Iterator[Dict]:
+        """
+        {"full": bool} first, then iter_graph_changes(since) or, if `since`
+        is older than tombstone retention, the full graph and an as_of
+        """
+        if not is_beyond_retention(since):
+            yield {"full": False}
+            yield from self.iter_graph_changes(since)
+            return
+        as_of = self._now()
+        yield {"full": True}
+        yield from self.iter_skill_graph()
+        yield {"as_of": as_of}
+
+    def get_graph_delta(self, since: datetime) -> Dict:
+        """
+        Collect iter_graph_changes into one payload
+        If `since` is older than tombstone retention the removals can't be
+        trusted, so the full graph is returned with full=True instead.
+        """
+        if is_beyond_retention(since):
+            return {**self.get_skill_graph(), "full": True}
+        return {"removed": [], **collect_graph(self.iter_graph_changes(since)), "full": False}
+
     def get_skill_graph(self) -> Dict:
         """Get complete skill graph for D3.js visualization"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (n)-[r]->(m)
-                RETURN n, r, m
-            """)
-            
-            nodes = []
-            links = []
-            node_ids = set()
-            
-            for record in result:
-                n = record["n"]
-                m = record["m"]
-                r = record["r"]
-                
-                # Add nodes
-                if n.id not in node_ids:
-                    nodes.append({
-                        "id": n.id,
-                        "name": n["name"],
-                        "type": list(n.labels)[0]
-                    })
-                    node_ids.add(n.id)
-                
-                if m.id not in node_ids:
-                    nodes.append({
-                        "id": m.id,
-                        "name": m["name"],
-                        "type": list(m.labels)[0]
-                    })
-                    node_ids.add(m.id)
-                
-                # Add links
-                links.append({
-                    "source": n.id,
-                    "target": m.id,
-                    "type": r.type
-                })
-            
-            return {"nodes": nodes, "links": links}
+        as_of = self._now()
+        return {**collect_graph(self.iter_skill_graph()), "as_of": as_of}
     
     def get_job_skills(self, job_role: str) -> List[Dict]:
         """Get all skills demanded by a specific job role"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (j:JobRole {name: $job_role})-[r:DEMANDS]->(s:Skill)
-                RETURN s.name as skill, 
-                       r.demand_percentage as demand,
-                       r.priority as priority
-                ORDER BY r.demand_percentage DESC
-            """, job_role=job_role)
-            
-            return [dict(record) for record in result]
+        return self.conn.execute_query(JOB_SKILLS_QUERY, {"job_role": job_role})
     
-    def get_trending_skills(self) -> List[Dict]:
-        """Show trending skills across all job roles"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (s:Skill)<-[r:DEMANDS]-(j:JobRole)
-                RETURN s.name as skill, 
-                       count(j) as job_count,
-                       avg(r.demand_percentage) as avg_demand
-                ORDER BY job_count DESC, avg_demand DESC
-                LIMIT 10
-            """)
-            return [dict(record) for record in result]
+    def get_trending_skills(self, limit: int = 10, categories: Optional[List[str]] = None) -> List[Dict]:
+        """Skills demanded by the most job roles, optionally within some categories"""
+        return self.conn.execute_query(TRENDING_SKILLS_QUERY, {"limit": limit, "categories": categories or []})
+
+
+class AsyncNeo4jService:
+    """Read side of Neo4jService for async routes, over the shared async driver"""
+
+    def __init__(self, conn: AsyncNeo4jConnection = async_neo4j_conn):
+        self.conn = conn
+
+    async def _now(self) -> int:
+        return (await self.conn.execute_query(NOW_QUERY))[0]["now"]
+
+    async def iter_skill_graph(self) -> AsyncIterator[Dict]:
+        """Async counterpart of Neo4jService.iter_skill_graph"""
+        async for record in self.conn.stream_query(GRAPH_NODES_QUERY):
+            yield {"node": record}
+        async for record in self.conn.stream_query(GRAPH_LINKS_QUERY):
+            yield {"link": record}
+
+    async def iter_graph_changes(self, since: datetime) -> AsyncIterator[Dict]:
+        """Async counterpart of Neo4jService.iter_graph_changes"""
+        as_of = await self._now()
+        params = {"since": since}
+        for label in DELTA_NODE_LABELS:
+            async for record in self.conn.stream_query(CHANGED_NODES_QUERY.format(label=label), params):
+                yield {"node": record}
+        for rel_type in DELTA_RELATIONSHIP_TYPES:
+            async for record in self.conn.stream_query(CHANGED_LINKS_QUERY.format(rel_type=rel_type), params):
+                yield {"link": record}
+        async for record in self.conn.stream_query(REMOVED_QUERY, params):
+            yield {"removed": record}
+        yield {"as_of": as_of}
+
+    async def iter_graph_delta(self, since: datetime) -> AsyncIterator[Dict]:
+        """Async counterpart of Neo4jService.iter_graph_delta"""
+        if not is_beyond_retention(since):
+            yield {"full": False}
+            async for item in self.iter_graph_changes(since):
+                yield item
+            return
+        as_of = await self._now()
+        yield {"full": True}
+        async for item in self.iter_skill_graph():
+            yield item
+        yield {"as_of": as_of}
+
+    async def get_skill_graph(self) -> Dict:
+        as_of = await self._now()
+        return {**collect_graph([item async for item in self.iter_skill_graph()]), "as_of": as_of}
+
+    async def get_graph_delta(self, since: datetime) -> Dict:
+        if is_beyond_retention(since):
+            return {**(await self.get_skill_graph()), "full": True}
+        items = [item async for item in self.iter_graph_changes(since)]
+        return {"removed": [], **collect_graph(items), "full": False}
+
+    async def get_job_skills(self, job_role: str) -> List[Dict]:
+        return await self.conn.execute_query(JOB_SKILLS_QUERY, {"job_role": job_role})
+
+    async def get_trending_skills(self, limit: int = 10, categories: Optional[List[str]] = None) -> List[Dict]:
+        return await self.conn.execute_query(TRENDING_SKILLS_QUERY, {"limit": limit, "categories": categories or []})
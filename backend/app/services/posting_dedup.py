@@ -0,0 +1,163 @@
+"""
+Near-duplicate job-posting removal with MinHash and LSH banding.
+
+Reposted and syndicated ads differ only in boilerplate, so exact hashing
+misses them and they inflate demand percentages. Each posting is reduced to
+a MinHash signature over its word shingles; the signature is split into
+bands, and postings that share any band bucket are candidates, confirmed
+when their estimated Jaccard similarity reaches the threshold. A posting
+is compared only with the few postings in its buckets, so a run is linear
+in the number of postings.
+
+Memory is one signature (num_perm 8-byte values) plus `bands` bucket
+entries per distinct posting remembered. An index remembers at most
+`window` postings (DEDUP_WINDOW); past that the one least recently kept
+or matched is forgotten, so memory stays flat over a long ingest and
+only reposts further apart than the window slip through.
+"""
+import re
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+
+# Smallest prime above 2**32: (a * h + b) stays below 2**64 for 32-bit a, b, h
+_PRIME = np.uint64(4294967311)
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int) -> List[str]:
+    """Overlapping `size`-word shingles of the lowercased text"""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows <= num_perm whose S-curve midpoint
+    (1 / bands) ** (1 / rows) lies closest to `threshold`
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        distance = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or distance < best[0]:
+            best = (distance, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateIndex:
+    """
+    Remembers the postings it has kept and tells whether a new one is a
+    near-duplicate of any of them. Feed it a batch or a whole stream.
+    With `window` > 0, only that many postings are remembered; a match
+    refreshes the posting it matched, like an LRU cache.
+    """
+
+    def __init__(
+        self,
+        threshold: float = settings.DEDUP_THRESHOLD,
+        num_perm: int = settings.DEDUP_NUM_PERM,
+        shingle_size: int = settings.DEDUP_SHINGLE_SIZE,
+        window: int = settings.DEDUP_WINDOW,
+        seed: int = 1
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.window = window
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        rng = np.random.RandomState(seed)
+        # Permutations h -> (a * h + b) mod p, one per signature slot
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        # id -> (signature, band keys), oldest first
+        self._signatures: "OrderedDict[int, Tuple[np.ndarray, List[Tuple[int, bytes]]]]" = OrderedDict()
+        self._next_id = 0
+        self.seen = 0
+        self.duplicates = 0
+        self.evicted = 0
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a posting, or None if it has no words"""
+        pieces = shingles(text, self.shingle_size)
+        if not pieces:
+            return None
+        hashes = np.fromiter((zlib.crc32(p.encode("utf-8")) for p in pieces), dtype=np.uint64, count=len(pieces))
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def _bands_of(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, text: str) -> Optional[int]:
+        """
+        Index a posting unless it near-duplicates one already kept.
+        Returns the id of the posting it duplicates, or None if it was kept.
+        """
+        self.seen += 1
+        signature = self.signature(text)
+        if signature is None:
+            return None
+
+        keys = list(self._bands_of(signature))
+        checked = set()
+        for band, key in keys:
+            for candidate in self._buckets[band].get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if np.mean(self._signatures[candidate][0] == signature) >= self.threshold:
+                    self.duplicates += 1
+                    self._signatures.move_to_end(candidate)
+                    return candidate
+
+        doc_id = self._next_id
+        self._next_id += 1
+        self._signatures[doc_id] = (signature, keys)
+        for band, key in keys:
+            self._buckets[band].setdefault(key, []).append(doc_id)
+        if self.window and len(self._signatures) > self.window:
+            self._evict()
+        return None
+
+    def _evict(self):
+        doc_id, (_, keys) = self._signatures.popitem(last=False)
+        for band, key in keys:
+            bucket = self._buckets[band][key]
+            bucket.remove(doc_id)
+            if not bucket:
+                del self._buckets[band][key]
+        self.evicted += 1
+
+    def stats(self) -> Dict:
+        return {
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "rows": self.rows,
+            "seen": self.seen,
+            "window": self.window,
+            "kept": self._next_id,
+            "remembered": len(self._signatures),
+            "evicted": self.evicted,
+            "duplicates": self.duplicates,
+        }
+
+
+def dedupe_postings(
+    postings: List[str],
+    threshold: float = settings.DEDUP_THRESHOLD,
+    num_perm: int = settings.DEDUP_NUM_PERM,
+    shingle_size: int = settings.DEDUP_SHINGLE_SIZE
+) -> Tuple[List[str], int]:
+    """Postings with near-duplicates removed (first occurrence kept), and how many were dropped"""
+    index = NearDuplicateIndex(threshold, num_perm, shingle_size)
+    kept = [posting for posting in postings if index.add(posting) is None]
+    return kept, index.duplicates
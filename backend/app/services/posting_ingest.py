@@ -0,0 +1,307 @@
+"""
+Streaming ingestion of job-posting corpora into the knowledge graph.
+
+Postings (title, description, date) are read one at a time from JSONL or
+CSV, near-duplicates of postings already seen are dropped (MinHash/LSH),
+the rest are matched against the skill taxonomy in chunks and folded into
+per-role counts. Every `flush_every` chunks the roles that changed are
+written to Neo4j in batched transactions and a checkpoint is saved, so an
+interrupted load resumes where it left off. Memory is bounded by the chunk
+size plus one skill counter per role (and per role and posting day with
+a history) and, with dedup on, one MinHash signature for each of the
+last DEDUP_WINDOW distinct postings; the postings themselves are not kept.
+With a DemandHistory, each role's demand is also tallied per posting
+day and, when the run completes, recorded as one observation per day at
+that date, so a backfill lands in the buckets the postings belong to.
+Postings without a usable date are recorded at the time of the run.
+
+Usage: python -m app.services.posting_ingest postings.jsonl --checkpoint load.ckpt
+"""
+import csv
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, IO, Iterator, List, Optional
+from app.core.config import settings
+from app.services.job_scraper import demand_summary
+from app.services.posting_dedup import NearDuplicateIndex
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_FLUSH_EVERY = 10
+
+
+def iter_postings(stream: IO[str], fmt: str = "jsonl") -> Iterator[Optional[Dict]]:
+    """
+    Yield {title, description, date} per record, or None for a record
+    that can't be used (bad JSON, missing title or description). `date`
+    is a naive UTC datetime, or None if missing or not ISO 8601.
+    """
+    if fmt == "jsonl":
+        records = (line for line in stream if line.strip())
+        for line in records:
+            try:
+                yield _posting(json.loads(line))
+            except ValueError:
+                yield None
+    elif fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield _posting(row)
+    else:
+        raise ValueError(f"Unsupported posting format '{fmt}'")
+
+
+def _posting(record) -> Optional[Dict]:
+    if not isinstance(record, dict):
+        return None
+    title = (record.get("title") or "").strip()
+    description = (record.get("description") or "").strip()
+    if not title or not description:
+        return None
+    return {"title": title, "description": description, "date": _parse_date(record.get("date"))}
+
+
+def _parse_date(value) -> Optional[datetime]:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+class PostingIngester:
+    """
+    Feeds a posting stream through a JobSkillExtractor and writes each
+    role's DEMANDS edges via Neo4jService.update_many_job_skills.
+    Demand for a role is computed over every posting seen for it so far,
+    so re-flushing a role just overwrites its edges with fresher totals.
+    The near-duplicate index lives in memory and is not checkpointed: after
+    a resume, postings are only compared with those read since, and it
+    only remembers the last DEDUP_WINDOW distinct postings.
+    With a history, per-day counts are kept alongside the totals
+    ("" is the day of postings without a date) and are checkpointed too.
+    A day's counts are dropped, and the checkpoint saved, as soon as they
+    are recorded, so re-running a finished load or resuming one that
+    stopped partway through recording doesn't add them to the rollups
+    twice.
+    """
+
+    def __init__(
+        self,
+        extractor,
+        neo4j_service,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        write_batch: int = 100,
+        checkpoint_path: Optional[str] = None,
+        dedupe: bool = settings.DEDUP_ENABLED,
+        history=None
+    ):
+        if chunk_size < 1 or flush_every < 1:
+            raise ValueError("chunk_size and flush_every must be positive")
+        self.extractor = extractor
+        self.neo4j = neo4j_service
+        self.chunk_size = chunk_size
+        self.flush_every = flush_every
+        self.write_batch = write_batch
+        self.checkpoint_path = checkpoint_path
+        self.dedup_index = NearDuplicateIndex() if dedupe else None
+        self.history = history
+
+        self.records = 0
+        self.postings = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.roles: Dict[str, Dict] = {}
+        # {title: {day ISO date or "": {"postings", "skills"}}}, only with a history
+        self.days: Dict[str, Dict[str, Dict]] = {}
+        self._dirty = set()
+
+    def _load_checkpoint(self) -> int:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            state = json.load(f)
+        self.records = state["records"]
+        self.postings = state["postings"]
+        self.invalid = state["invalid"]
+        self.duplicates = state.get("duplicates", 0)
+        self.roles = {
+            title: {"postings": role["postings"], "skills": Counter(role["skills"])}
+            for title, role in state["roles"].items()
+        }
+        self.days = {
+            title: {day: {"postings": tally["postings"], "skills": Counter(tally["skills"])}
+                    for day, tally in days.items()}
+            for title, days in state.get("days", {}).items()
+        }
+        print(f"↩️  Resuming after {self.records} records ({self.postings} postings)")
+        return self.records
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        state = {
+            "records": self.records,
+            "postings": self.postings,
+            "invalid": self.invalid,
+            "duplicates": self.duplicates,
+            "roles": {
+                title: {"postings": role["postings"], "skills": dict(role["skills"])}
+                for title, role in self.roles.items()
+            },
+            "days": {
+                title: {day: {"postings": tally["postings"], "skills": dict(tally["skills"])}
+                        for day, tally in days.items()}
+                for title, days in self.days.items()
+            },
+        }
+        # Write-then-rename so a crash never leaves a torn checkpoint
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _process(self, chunk: List[Dict]):
+        skill_sets, _ = self.extractor.match_descriptions([p["description"] for p in chunk])
+        for posting, skills in zip(chunk, skill_sets):
+            role = self.roles.setdefault(posting["title"], {"postings": 0, "skills": Counter()})
+            role["postings"] += 1
+            role["skills"].update(skills)
+            self._dirty.add(posting["title"])
+            if self.history is not None:
+                day = posting["date"].date().isoformat() if posting["date"] else ""
+                tally = self.days.setdefault(posting["title"], {}).setdefault(
+                    day, {"postings": 0, "skills": Counter()})
+                tally["postings"] += 1
+                tally["skills"].update(skills)
+        self.postings += len(chunk)
+
+    def _flush(self):
+        if self._dirty:
+            self.neo4j.update_many_job_skills(
+                {title: demand_summary(self.roles[title]["skills"], self.roles[title]["postings"])
+                 for title in sorted(self._dirty)},
+                batch_size=self.write_batch
+            )
+            self._dirty.clear()
+        self._save_checkpoint()
+
+    def run(self, stream: IO[str], fmt: str = "jsonl") -> Dict:
+        """Ingest a text stream and return counts and throughput"""
+        skip = self._load_checkpoint()
+        resumed_from = skip
+        started = time.perf_counter()
+        chunk: List[Dict] = []
+        chunks = 0
+
+        for posting in iter_postings(stream, fmt):
+            if skip:
+                skip -= 1
+                continue
+            self.records += 1
+            if posting is None:
+                self.invalid += 1
+                continue
+            if self.dedup_index is not None and self.dedup_index.add(posting["description"]) is not None:
+                self.duplicates += 1
+                continue
+            chunk.append(posting)
+            if len(chunk) < self.chunk_size:
+                continue
+
+            self._process(chunk)
+            chunk = []
+            chunks += 1
+            if chunks % self.flush_every == 0:
+                self._flush()
+                self._progress(started, resumed_from)
+
+        if chunk:
+            self._process(chunk)
+        self._flush()
+        if self.history is not None:
+            self._record_history()
+
+        elapsed = time.perf_counter() - started
+        processed = self.records - resumed_from
+        return {
+            "records": self.records,
+            "postings": self.postings,
+            "invalid": self.invalid,
+            "duplicates": self.duplicates,
+            "roles": len(self.roles),
+            "resumed_from": resumed_from,
+            "seconds": round(elapsed, 2),
+            "records_per_second": round(processed / elapsed, 1) if elapsed else None,
+        }
+
+    def _record_history(self):
+        """One history observation per role and posting day, oldest day first"""
+        by_day: Dict[str, Dict[str, Dict]] = {}
+        for title, days in self.days.items():
+            for day, tally in days.items():
+                by_day.setdefault(day, {})[title] = tally
+        # Undated postings ("") go last and are observed now
+        for day in sorted(by_day, key=lambda d: (d == "", d)):
+            tallies = by_day[day]
+            recorded = self.history.record_many(
+                {title: demand_summary(t["skills"], t["postings"]) for title, t in tallies.items()},
+                {title: t["postings"] for title, t in tallies.items()},
+                observed_at=datetime.fromisoformat(day) if day else None
+            )
+            if not recorded:
+                # Kept in the checkpoint, so a re-run records the day then
+                continue
+            for title in tallies:
+                del self.days[title][day]
+                if not self.days[title]:
+                    del self.days[title]
+            self._save_checkpoint()
+
+    def _progress(self, started: float, resumed_from: int):
+        elapsed = time.perf_counter() - started
+        rate = (self.records - resumed_from) / elapsed if elapsed else 0
+        print(f"📦 {self.records} records, {self.postings} postings, {self.duplicates} duplicates, "
+              f"{len(self.roles)} roles ({rate:.0f} records/s)")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from app.core.neo4j_db import neo4j_conn
+    from app.core.providers import neo4j_service, skill_extractor
+    from app.services.demand_history import demand_history
+
+    parser = argparse.ArgumentParser(description="Stream job postings into the knowledge graph")
+    parser.add_argument("path", help="JSONL or CSV file, or - for stdin")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--flush-every", type=int, default=DEFAULT_FLUSH_EVERY,
+                        help="chunks between Neo4j writes and checkpoints")
+    parser.add_argument("--checkpoint", help="resume from / save progress to this file")
+    parser.add_argument("--no-dedupe", action="store_true", help="keep near-duplicate postings")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "jsonl")
+    neo4j_conn.connect()
+    try:
+        ingester = PostingIngester(skill_extractor.get(), neo4j_service.get(), args.chunk_size,
+                                   args.flush_every, checkpoint_path=args.checkpoint,
+                                   dedupe=not args.no_dedupe,
+                                   history=demand_history if settings.DEMAND_HISTORY_ENABLED else None)
+        if args.path == "-":
+            report = ingester.run(sys.stdin, fmt)
+        else:
+            with open(args.path, encoding="utf-8", newline="") as f:
+                report = ingester.run(f, fmt)
+        print(f"✅ Ingested {report['postings']} postings for {report['roles']} roles "
+              f"({report['invalid']} invalid, {report['duplicates']} near-duplicates) in {report['seconds']}s "
+              f"({report['records_per_second']} records/s)")
+    finally:
+        neo4j_conn.close()
@@ -0,0 +1,109 @@
+from typing import Dict, List
+import numpy as np
+from app.services.graph_snapshot import GraphDerivedCache
+
+JOB_SKILL_WEIGHTS_QUERY = """
+MATCH (j:JobRole)-[r:REQUIRES|DEMANDS]->(s:Skill)
+RETURN j.name as job, s.name as skill, type(r) as type,
+       r.importance as importance, r.demand_percentage as demand
+"""
+
+
+class ReadinessEngine:
+    """
+    Scores a user's skill mastery against every job role at once.
+
+    `weights` is a dense job x skill matrix in [0, 1]: REQUIRES.importance
+    is scaled from 0-10 and DEMANDS.demand_percentage from 0-100, keeping
+    the larger of the two when a role has both edges to a skill. A role's
+    readiness is its weight-averaged mastery, so ranking all roles is a
+    single matrix-vector product.
+    """
+
+    def __init__(self, rows: List[Dict]):
+        self.jobs: List[str] = []
+        self.skills: List[str] = []
+        job_ids: Dict[str, int] = {}
+        skill_ids: Dict[str, int] = {}
+        job_idx, skill_idx, values = [], [], []
+
+        for row in rows:
+            if row["type"] == "REQUIRES":
+                weight = (row["importance"] or 0) / 10
+            else:
+                weight = (row["demand"] or 0) / 100
+            if weight <= 0:
+                continue
+            if row["job"] not in job_ids:
+                job_ids[row["job"]] = len(self.jobs)
+                self.jobs.append(row["job"])
+            if row["skill"] not in skill_ids:
+                skill_ids[row["skill"]] = len(self.skills)
+                self.skills.append(row["skill"])
+            job_idx.append(job_ids[row["job"]])
+            skill_idx.append(skill_ids[row["skill"]])
+            values.append(min(weight, 1.0))
+
+        self.skill_ids = {name.lower(): i for name, i in skill_ids.items()}
+        self.weights = np.zeros((len(self.jobs), len(self.skills)), dtype=np.float32)
+        np.maximum.at(self.weights, (np.array(job_idx, dtype=np.int64), np.array(skill_idx, dtype=np.int64)),
+                      np.array(values, dtype=np.float32))
+        self.row_totals = self.weights.sum(axis=1)
+
+    @classmethod
+    def from_neo4j(cls, neo4j) -> "ReadinessEngine":
+        return cls(neo4j.execute_query(JOB_SKILL_WEIGHTS_QUERY))
+
+    def mastery_vector(self, mastery: Dict[str, float]):
+        """Map {skill name: mastery 0-1} onto the skill axis"""
+        vector = np.zeros(len(self.skills), dtype=np.float32)
+        unrecognized = []
+        for name, level in mastery.items():
+            i = self.skill_ids.get(name.lower())
+            if i is None:
+                unrecognized.append(name)
+            else:
+                vector[i] = min(max(level, 0.0), 1.0)
+        return vector, unrecognized
+
+    def rank(self, mastery: Dict[str, float], top_k: int = 5, max_gaps: int = 5) -> Dict:
+        """Top-k job roles by readiness, each with its largest skill gaps"""
+        vector, unrecognized = self.mastery_vector(mastery)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(self.row_totals > 0, (self.weights @ vector) / self.row_totals, 0.0)
+
+        k = min(top_k, len(self.jobs))
+        if k == 0:
+            top = np.array([], dtype=np.int64)
+        else:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+        rankings = []
+        for j in top.tolist():
+            gap = self.weights[j] * (1.0 - vector)
+            missing = np.nonzero(gap > 0)[0]
+            missing = missing[np.argsort(-gap[missing], kind="stable")][:max_gaps]
+            rankings.append({
+                "job_role": self.jobs[j],
+                "readiness": round(float(scores[j]) * 100, 1),
+                "gaps": [
+                    {
+                        "skill": self.skills[s],
+                        "weight": round(float(self.weights[j, s]), 2),
+                        "mastery": round(float(vector[s]), 2),
+                        "gap": round(float(gap[s]), 2),
+                    }
+                    for s in missing.tolist()
+                ],
+            })
+
+        return {
+            "rankings": rankings,
+            "unrecognized_skills": unrecognized,
+            "total_roles": len(self.jobs),
+        }
+
+
+# Global engine shared by every request in this process
+readiness_engine = GraphDerivedCache(ReadinessEngine.from_neo4j)
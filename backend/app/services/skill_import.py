@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+import time
+from typing import Dict, List
+from app.schemas.skill import SkillImport
+from app.services.graph_snapshot import graph_snapshot
+
+DEFAULT_BATCH_SIZE = 1000
+
+IMPORT_QUERIES = {
+    "skills": """
+        UNWIND $rows AS row
+        MERGE (s:Skill {name: row.name})
+        SET s.category = coalesce(row.category, s.category),
+            s.difficulty = coalesce(row.difficulty, s.difficulty),
+            s.aliases = coalesce(row.aliases, s.aliases),
+            s.updated_at = datetime()
+    """,
+    "prerequisites": """
+        UNWIND $rows AS row
+        MERGE (s:Skill {name: row.skill})
+        ON CREATE SET s.updated_at = datetime()
+        MERGE (p:Skill {name: row.prerequisite})
+        ON CREATE SET p.updated_at = datetime()
+        MERGE (s)-[r:PREREQUISITE]->(p)
+        ON CREATE SET r.updated_at = datetime()
+    """,
+    "requirements": """
+        UNWIND $rows AS row
+        MERGE (j:JobRole {name: row.job})
+        ON CREATE SET j.updated_at = datetime(), j.demand_score = 0
+        MERGE (s:Skill {name: row.skill})
+        ON CREATE SET s.updated_at = datetime()
+        MERGE (j)-[r:REQUIRES]->(s)
+        SET r.importance = coalesce(row.importance, r.importance),
+            r.updated_at = datetime()
+    """,
+}
+
+
+def parse_import(content: str, fmt: str = "json") -> SkillImport:
+    """
+    Parse an import file.
+    JSON: {"skills": [...], "prerequisites": [...], "requirements": [...]}
+    CSV: header kind,name,category,difficulty,target,importance[,aliases]
+    where kind is skill, prerequisite (name needs target) or requires (job
+    name requires target skill); aliases are separated by "|".
+    Raises ValueError (pydantic's ValidationError is one) for bad input.
+    """
+    if fmt == "json":
+        data = json.loads(content)
+        if not isinstance(data, dict):
+            raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+        return SkillImport(**data)
+    if fmt != "csv":
+        raise ValueError(f"Unsupported import format '{fmt}'")
+
+    data = {"skills": [], "prerequisites": [], "requirements": []}
+    for line, row in enumerate(csv.DictReader(io.StringIO(content)), start=2):
+        kind = (row.get("kind") or "").strip().lower()
+        name = (row.get("name") or "").strip()
+        target = (row.get("target") or "").strip()
+        if kind == "skill":
+            data["skills"].append({
+                "name": name,
+                "category": row.get("category") or None,
+                "difficulty": row.get("difficulty") or None,
+                "aliases": [a.strip() for a in row["aliases"].split("|") if a.strip()]
+                if row.get("aliases") else None,
+            })
+        elif kind == "prerequisite":
+            data["prerequisites"].append({"skill": name, "prerequisite": target})
+        elif kind == "requires":
+            importance = (row.get("importance") or "").strip()
+            data["requirements"].append({
+                "job": name,
+                "skill": target,
+                "importance": int(importance) if importance else None,
+            })
+        else:
+            raise ValueError(f"Line {line}: unknown kind '{kind}'")
+    return SkillImport(**data)
+
+
+class SkillImporter:
+    """
+    Idempotent bulk loader for skills, PREREQUISITE and REQUIRES edges.
+    Rows are MERGEd in UNWIND batches, one write transaction per batch.
+    """
+
+    def __init__(self, neo4j, batch_size: int = DEFAULT_BATCH_SIZE):
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.neo4j = neo4j
+        self.batch_size = batch_size
+
+    def run(self, data: SkillImport) -> Dict:
+        """Import everything and return per-batch timing and throughput"""
+        batches: List[Dict] = []
+        started = time.perf_counter()
+
+        # Skills first so edges attach to fully populated nodes
+        for phase in ("skills", "prerequisites", "requirements"):
+            rows = [item.dict() for item in getattr(data, phase)]
+            for start in range(0, len(rows), self.batch_size):
+                chunk = rows[start:start + self.batch_size]
+                batch_started = time.perf_counter()
+                self.neo4j.execute_write(IMPORT_QUERIES[phase], {"rows": chunk})
+                elapsed = time.perf_counter() - batch_started
+                batches.append({
+                    "phase": phase,
+                    "batch": start // self.batch_size + 1,
+                    "rows": len(chunk),
+                    "seconds": round(elapsed, 4),
+                    "rows_per_second": round(len(chunk) / elapsed, 1) if elapsed else None,
+                })
+
+        total_rows = sum(b["rows"] for b in batches)
+        if total_rows:
+            graph_snapshot.bump()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "skills": len(data.skills),
+            "prerequisites": len(data.prerequisites),
+            "requirements": len(data.requirements),
+            "batch_size": self.batch_size,
+            "batches": batches,
+            "total_seconds": round(elapsed, 4),
+            "rows_per_second": round(total_rows / elapsed, 1) if elapsed else None,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from app.core.neo4j_db import neo4j_conn
+
+    parser = argparse.ArgumentParser(description="Bulk import skills into Neo4j")
+    parser.add_argument("path", help="JSON or CSV file, or - for stdin")
+    parser.add_argument("--format", choices=["json", "csv"], help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "json")
+    if args.path == "-":
+        content = sys.stdin.read()
+    else:
+        with open(args.path, encoding="utf-8") as f:
+            content = f.read()
+
+    neo4j_conn.connect()
+    try:
+        report = SkillImporter(neo4j_conn, args.batch_size).run(parse_import(content, fmt))
+        for batch in report["batches"]:
+            print(f"📦 {batch['phase']} #{batch['batch']}: {batch['rows']} rows "
+                  f"in {batch['seconds']}s ({batch['rows_per_second']} rows/s)")
+        print(f"✅ Imported {report['skills']} skills, {report['prerequisites']} prerequisites, "
+              f"{report['requirements']} requirements in {report['total_seconds']}s")
+    finally:
+        neo4j_conn.close()
@@ -0,0 +1,196 @@
+import heapq
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from app.services.graph_snapshot import GraphDerivedCache
+
+SKILLS_QUERY = """
+MATCH (s:Skill)
+RETURN s.name as name, s.category as category, s.difficulty as difficulty
+ORDER BY s.name
+"""
+
+PREREQUISITES_QUERY = """
+MATCH (s:Skill)-[:PREREQUISITE]->(p:Skill)
+RETURN s.name as skill, p.name as prerequisite
+"""
+
+# Roles without REQUIRES edges come back once with a null skill, so they
+# are known to the index with no requirements
+REQUIREMENTS_QUERY = """
+MATCH (j:JobRole)
+OPTIONAL MATCH (j)-[r:REQUIRES]->(s:Skill)
+RETURN j.name as job, s.name as skill, r.importance as importance
+ORDER BY j.name
+"""
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, n: int):
+    """Build (indptr, indices, order) for edges grouped by source id"""
+    order = np.argsort(sources, kind="stable")
+    indices = targets[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return indptr, indices, order
+
+
+class SkillPrerequisiteIndex:
+    """
+    Compact, read-only adjacency index over the skill graph.
+
+    `(s)-[:PREREQUISITE]->(p)` means p must be learned before s.
+    Skills are numbered 0..n-1 and edges are stored CSR-style:
+    the prerequisites of skill i are
+    prereq_indices[prereq_indptr[i]:prereq_indptr[i + 1]].
+    Job requirements are stored the same way, with importance in a
+    parallel array.
+    """
+
+    def __init__(self, skills: List[Dict], prerequisites: List[Dict], requirements: List[Dict]):
+        self.names = [s["name"] for s in skills]
+        self.categories = [s.get("category") for s in skills]
+        self.difficulties = [s.get("difficulty") for s in skills]
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self._ids_lower = {name.lower(): i for i, name in enumerate(self.names) if name}
+        n = len(self.names)
+
+        edges = [
+            (self.ids[e["skill"]], self.ids[e["prerequisite"]])
+            for e in prerequisites
+            if e["skill"] in self.ids and e["prerequisite"] in self.ids
+        ]
+        src = np.array([e[0] for e in edges], dtype=np.int64)
+        dst = np.array([e[1] for e in edges], dtype=np.int64)
+        self.prereq_indptr, self.prereq_indices, _ = _csr(src, dst, n)
+
+        self.jobs = []
+        job_ids = {}
+        job_src, job_dst, importance = [], [], []
+        for r in requirements:
+            if r["job"] is None:
+                continue
+            if r["job"] not in job_ids:
+                job_ids[r["job"]] = len(self.jobs)
+                self.jobs.append(r["job"])
+            if r["skill"] not in self.ids:
+                continue
+            job_src.append(job_ids[r["job"]])
+            job_dst.append(self.ids[r["skill"]])
+            importance.append(r["importance"] or 0)
+        self.job_ids = job_ids
+        self.job_indptr, self.job_skill_indices, order = _csr(
+            np.array(job_src, dtype=np.int64), np.array(job_dst, dtype=np.int64), len(self.jobs)
+        )
+        self.job_importance = np.array(importance, dtype=np.float64)[order]
+
+    @classmethod
+    def from_neo4j(cls, neo4j) -> "SkillPrerequisiteIndex":
+        return cls(
+            neo4j.execute_query(SKILLS_QUERY),
+            neo4j.execute_query(PREREQUISITES_QUERY),
+            neo4j.execute_query(REQUIREMENTS_QUERY),
+        )
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Resolve a skill name (case-insensitive) to its id"""
+        if name in self.ids:
+            return self.ids[name]
+        return self._ids_lower.get(name.lower())
+
+    def prerequisites(self, skill_id: int) -> np.ndarray:
+        return self.prereq_indices[self.prereq_indptr[skill_id]:self.prereq_indptr[skill_id + 1]]
+
+    def job_requirements(self, job_name: str) -> Optional[Dict[int, float]]:
+        """Return {skill_id: importance} for a job ({} if it requires nothing), or None if unknown"""
+        j = self.job_ids.get(job_name)
+        if j is None:
+            return None
+        lo, hi = self.job_indptr[j], self.job_indptr[j + 1]
+        return dict(zip(self.job_skill_indices[lo:hi].tolist(), self.job_importance[lo:hi].tolist()))
+
+    def learning_path(self, job_name: str, known_skills: Iterable[str]) -> Optional[Dict]:
+        """
+        Ordered learning plan for a job role.
+        Returns a topological order (prerequisites first) over the
+        transitive prerequisites of every required skill the user doesn't
+        know yet. Known skills and everything beneath them are pruned.
+        None if the role doesn't exist; a role with no requirements gets
+        an empty plan.
+        """
+        required = self.job_requirements(job_name)
+        if required is None:
+            return None
+
+        known = set()
+        unknown_names = []
+        for name in known_skills:
+            skill_id = self.lookup(name)
+            if skill_id is None:
+                unknown_names.append(name)
+            else:
+                known.add(skill_id)
+
+        # Collect the transitive prerequisites that still need learning
+        needed = set()
+        stack = [s for s in required if s not in known]
+        while stack:
+            s = stack.pop()
+            if s in needed:
+                continue
+            needed.add(s)
+            for p in self.prerequisites(s).tolist():
+                if p not in known and p not in needed:
+                    stack.append(p)
+
+        # Kahn's algorithm over the needed subgraph
+        pending = {}
+        dependents: Dict[int, List[int]] = {}
+        for s in needed:
+            prereqs = [p for p in self.prerequisites(s).tolist() if p in needed]
+            pending[s] = len(prereqs)
+            for p in prereqs:
+                dependents.setdefault(p, []).append(s)
+
+        depth = {s: 0 for s in needed}
+        ready = [(self.names[s], s) for s, count in pending.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, s = heapq.heappop(ready)
+            order.append(s)
+            for d in dependents.get(s, []):
+                depth[d] = max(depth[d], depth[s] + 1)
+                pending[d] -= 1
+                if pending[d] == 0:
+                    heapq.heappush(ready, (self.names[d], d))
+
+        # Anything left is part of a prerequisite cycle
+        cyclic = sorted((s for s in needed if pending[s] > 0), key=lambda s: self.names[s])
+        order.extend(cyclic)
+
+        plan = [
+            {
+                "step": i,
+                "skill": self.names[s],
+                "category": self.categories[s],
+                "difficulty": self.difficulties[s],
+                "depth": depth[s],
+                "required_by_job": s in required,
+                "importance": required.get(s),
+            }
+            for i, s in enumerate(order, start=1)
+        ]
+        return {
+            "job_role": job_name,
+            "plan": plan,
+            "already_known": sorted(self.names[s] for s in known if s in required),
+            "unrecognized_skills": unknown_names,
+            "stats": {
+                "required_skills": len(required),
+                "steps": len(plan),
+                "cyclic_skills": [self.names[s] for s in cyclic],
+            }
+        }
+
+
+# Global index shared by every request in this process
+skill_index = GraphDerivedCache(SkillPrerequisiteIndex.from_neo4j)
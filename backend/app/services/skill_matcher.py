@@ -0,0 +1,62 @@
+import hashlib
+from typing import Dict, Iterable, Mapping, Set
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
+
+
+class SkillMatcher:
+    """
+    The skill taxonomy compiled into one spaCy PhraseMatcher.
+
+    `taxonomy` maps each canonical skill name to its aliases; a mention of
+    the name or any alias reports the canonical name. Phrases are matched
+    case-insensitively on whole tokens, so "java" doesn't fire inside
+    "javascript" nor "git" inside "github". Matching hashes each token once
+    and is linear in document length, however many phrases the taxonomy
+    holds.
+    """
+
+    def __init__(self, nlp, taxonomy: Mapping[str, Iterable[str]]):
+        self.nlp = nlp
+        self.phrases = self.phrases_of(taxonomy)
+        self.skills = sorted(set(self.phrases.values()))
+        self.version = self.fingerprint(self.phrases)
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        # Tokenize patterns with the same tokenizer as the documents
+        patterns: Dict[str, list] = {}
+        for (phrase, skill), pattern in zip(self.phrases.items(), nlp.tokenizer.pipe(self.phrases)):
+            patterns.setdefault(skill, []).append(pattern)
+        for skill, docs in patterns.items():
+            self.matcher.add(skill, docs)
+
+    @staticmethod
+    def phrases_of(taxonomy: Mapping[str, Iterable[str]]) -> Dict[str, str]:
+        """
+        {lowercased phrase: canonical name} for every name and alias
+        When two skills claim the same phrase, the first in sorted name
+        order keeps it.
+        """
+        phrases: Dict[str, str] = {}
+        for name in sorted(taxonomy):
+            canonical = name.strip()
+            if not canonical:
+                continue
+            for phrase in [canonical, *(taxonomy[name] or [])]:
+                phrase = phrase.strip().lower()
+                if phrase and phrase not in phrases:
+                    phrases[phrase] = canonical
+        return phrases
+
+    @staticmethod
+    def fingerprint(phrases: Mapping[str, str]) -> str:
+        """Changes whenever any phrase or its skill does; keys cached extraction results"""
+        lines = sorted(f"{phrase}\t{skill}" for phrase, skill in phrases.items())
+        return hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def skills_in(self, doc: Doc) -> Set[str]:
+        """Distinct canonical skills mentioned in a document"""
+        strings = self.nlp.vocab.strings
+        return {strings[match_id] for match_id, _, _ in self.matcher(doc)}
@@ -0,0 +1,160 @@
+"""
+The skill taxonomy: canonical Skill names in the graph plus their aliases.
+
+Skill nodes carry an optional `aliases` list ("k8s" for kubernetes,
+"sklearn" for scikit-learn). SkillTaxonomy compiles them into a
+SkillMatcher and keeps it current: when graph_snapshot.version moves (or
+GRAPH_SNAPSHOT_TTL_SECONDS passes, for writes made by other workers) the
+graph is re-read and a new matcher compiled on a background thread, then
+swapped in with a single assignment. Extraction always uses whatever
+matcher is current and never waits for a reload.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from app.core.config import settings
+from app.services.graph_snapshot import graph_snapshot
+from app.services.skill_matcher import SkillMatcher
+
+TAXONOMY_QUERY = """
+MATCH (s:Skill)
+RETURN s.name as name, coalesce(s.aliases, []) as aliases
+ORDER BY name
+"""
+
+# Built-in taxonomy under display names, seeded into the graph by graph
+# migration 5 and used until the graph has been read
+DEFAULT_TAXONOMY: Dict[str, List[str]] = {
+    "Python": ["python3"],
+    "Java": [],
+    "JavaScript": ["js", "ecmascript"],
+    "TypeScript": [],
+    "React": ["react.js", "reactjs"],
+    "Vue": ["vue.js", "vuejs"],
+    "Angular": ["angularjs"],
+    "Node.js": ["nodejs"],
+    "FastAPI": [],
+    "Django": [],
+    "Flask": [],
+    "Spring Boot": ["springboot"],
+    "Machine Learning": ["ml"],
+    "Deep Learning": [],
+    "NLP": ["natural language processing"],
+    "Computer Vision": [],
+    "PyTorch": ["torch"],
+    "TensorFlow": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "pandas": [],
+    "NumPy": [],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Terraform": [],
+    "PostgreSQL": ["postgres", "psql"],
+    "MongoDB": ["mongo"],
+    "Neo4j": [],
+    "Redis": [],
+    "Elasticsearch": ["elastic search"],
+    "Git": [],
+    "CI/CD": ["cicd", "continuous integration"],
+    "Jenkins": [],
+    "GitHub Actions": [],
+    "Agile": [],
+    "Scrum": [],
+    "REST API": ["rest apis", "restful api", "restful apis"],
+    "GraphQL": [],
+    "Microservices": ["microservice"],
+}
+
+
+def load_taxonomy(conn) -> Dict[str, List[str]]:
+    """{canonical name: aliases} for every Skill node"""
+    return {row["name"]: list(row["aliases"]) for row in conn.execute_query(TAXONOMY_QUERY) if row["name"]}
+
+
+class SkillTaxonomy:
+    """
+    A SkillMatcher kept in step with the graph by background rebuilds.
+    `load()` returns the current {name: aliases}; until it has succeeded
+    once, `fallback` is matched instead.
+    """
+
+    def __init__(
+        self,
+        nlp,
+        load: Callable[[], Dict[str, List[str]]],
+        fallback: Dict[str, List[str]] = DEFAULT_TAXONOMY,
+        ttl_seconds: int = settings.GRAPH_SNAPSHOT_TTL_SECONDS
+    ):
+        self.nlp = nlp
+        self.load = load
+        self.ttl_seconds = ttl_seconds
+        self._matcher = SkillMatcher(nlp, fallback)
+        self._lock = threading.Lock()
+        self._refreshing: Optional[threading.Thread] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self.source = "fallback"
+        self.reloads = 0
+        self.error: Optional[str] = None
+
+    def _is_stale(self) -> bool:
+        if self._version != graph_snapshot.version:
+            return True
+        return bool(self.ttl_seconds) and time.monotonic() - self._checked_at > self.ttl_seconds
+
+    def matcher(self) -> SkillMatcher:
+        """The current matcher; starts a background reload if the graph changed"""
+        if self._is_stale():
+            self.refresh()
+        return self._matcher
+
+    def refresh(self, wait: bool = False):
+        """Reload from the graph on a background thread (at most one at a time)"""
+        with self._lock:
+            thread = self._refreshing
+            if thread is None:
+                thread = threading.Thread(target=self._rebuild, args=(graph_snapshot.version,),
+                                          name="skill-taxonomy", daemon=True)
+                self._refreshing = thread
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _rebuild(self, version: int):
+        try:
+            taxonomy = self.load()
+            phrases = SkillMatcher.phrases_of(taxonomy)
+            if not phrases:
+                # Nothing in the graph yet; keep matching what we have
+                raise ValueError("no Skill nodes in the graph")
+            if SkillMatcher.fingerprint(phrases) != self._matcher.version:
+                matcher = SkillMatcher(self.nlp, taxonomy)
+                self._matcher = matcher
+                self.reloads += 1
+                print(f"🔄 Skill taxonomy reloaded: {len(matcher)} skills, {len(matcher.phrases)} phrases")
+            self.source = "graph"
+            self.error = None
+        except Exception as e:
+            self.error = str(e)
+            print(f"⚠️  Skill taxonomy reload failed, keeping the current one: {e}")
+        finally:
+            with self._lock:
+                # Failures are retried after the TTL, not on every request
+                self._version = version
+                self._checked_at = time.monotonic()
+                self._refreshing = None
+
+    def status(self) -> Dict:
+        return {
+            "source": self.source,
+            "skills": len(self._matcher),
+            "phrases": len(self._matcher.phrases),
+            "version": self._matcher.version,
+            "graph_version": self._version,
+            "reloads": self.reloads,
+            "error": self.error,
+        }
+
@@ -52,6 +52,11 @@ const SkillGraph = () => {
       .force('center', d3.forceCenter(width / 2, height / 2))
       .force('collision', d3.forceCollide().radius(30));
 
+    // Nodes arrive with server-computed x/y; only a short settle is needed
+    if (graphData.nodes.every(n => n.x !== undefined && n.y !== undefined)) {
+      simulation.alpha(0.1);
+    }
+
     // Add arrow markers for links
     svg.append('defs').selectAll('marker')
       .data(['prerequisite'])
@@ -9,8 +9,25 @@ const apiClient = axios.create({
 
 export default {
   // --- Job & Skill Endpoints ---
-  scrapeAndAnalyzeJob: (jobTitle) => {
-    return apiClient.post(`/api/jobs/scrape-and-analyze?job_title=${jobTitle}`);
+  // Queues the analysis, then polls until it finishes; resolves like the
+  // old synchronous call, with the result as response.data. Rejects with
+  // an Error whose status is 'failed' if the job fails or isn't done
+  // within timeoutMs.
+  scrapeAndAnalyzeJob: async (jobTitle, pollMs = 1000, timeoutMs = 120000) => {
+    const queued = await apiClient.post(
+      `/api/jobs/scrape-and-analyze?job_title=${encodeURIComponent(jobTitle)}`
+    );
+    const deadline = Date.now() + timeoutMs;
+    const failed = (message, job) => Object.assign(new Error(message), { status: 'failed', job });
+    for (;;) {
+      const { data: job } = await apiClient.get(queued.data.status_url);
+      if (job.status === 'done') return { ...queued, data: job.result };
+      if (job.status === 'failed') throw failed(job.error || 'Analysis failed', job);
+      if (Date.now() + pollMs > deadline) {
+        throw failed(`Analysis still ${job.status} after ${Math.round(timeoutMs / 1000)}s`, job);
+      }
+      await new Promise((resolve) => setTimeout(resolve, pollMs));
+    }
   },
   getSkillGraph: () => {
     return apiClient.get('/api/skills/graph');
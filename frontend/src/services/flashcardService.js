@@ -12,7 +12,7 @@ const getAuthHeader = () => {
 export const flashcardService = {
     getAll: async (params = {}) => {
         const response = await axios.get(API_URL + '/', { ...getAuthHeader(), params });
-        return response.data;
+        return response.data.items;
     },
 
     create: async (data) => {